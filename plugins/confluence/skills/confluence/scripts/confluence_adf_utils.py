@@ -224,6 +224,27 @@ def get_page_adf(base_url: str, auth: Tuple[str, str], page_id: str) -> Dict[str
     return response.json()
 
 
+def _compact_json(value: Any) -> str:
+    """Serialize to JSON without insignificant whitespace or \\u escapes."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_request(method: str, url: str, auth: Tuple[str, str], payload: Dict):
+    """Send a JSON request body encoded once as compact UTF-8 bytes.
+
+    The ADF body travels as a JSON string inside the payload, so every quote
+    in it is escaped again; dropping whitespace and non-ASCII escapes keeps
+    large pages noticeably smaller on the wire.
+    """
+    return requests.request(
+        method,
+        url,
+        auth=auth,
+        data=_compact_json(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+
+
 def update_page_adf(
     base_url: str,
     auth: Tuple[str, str],
@@ -262,14 +283,14 @@ def update_page_adf(
         "id": page_id,
         "status": "current",
         "title": title,  # Must provide existing title
-        "body": {"representation": "atlas_doc_format", "value": json.dumps(body)},
+        "body": {"representation": "atlas_doc_format", "value": _compact_json(body)},
         "version": {
             "number": version + 1,
             "message": version_message or "Updated via Python REST API",
         },
     }
 
-    response = requests.put(url, auth=auth, json=payload)
+    response = _json_request("PUT", url, auth, payload)
 
     if not response.ok:
         print(f"❌ API Error Response: {response.text}", file=sys.stderr)
@@ -315,12 +336,12 @@ def create_page_adf(
         "spaceId": space_id,
         "status": "current",
         "title": title,
-        "body": {"representation": "atlas_doc_format", "value": json.dumps(body)},
+        "body": {"representation": "atlas_doc_format", "value": _compact_json(body)},
     }
     if parent_id:
         payload["parentId"] = parent_id
 
-    response = requests.post(url, auth=auth, json=payload)
+    response = _json_request("POST", url, auth, payload)
 
     if not response.ok:
         print(f"❌ API Error Response: {response.text}", file=sys.stderr)
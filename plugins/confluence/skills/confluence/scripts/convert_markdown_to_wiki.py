@@ -32,111 +32,140 @@ import mistune
 
 
 class WikiMarkupRenderer(mistune.BaseRenderer):
-    """Renderer that outputs Confluence Wiki Markup."""
+    """Renderer that outputs Confluence Wiki Markup.
+
+    Fragments are appended to a single list buffer kept in
+    ``state.env["buf"]`` and joined once at the end, instead of every
+    method returning a new string for its parent to concatenate.
+    """
 
     NAME = "wiki"
 
+    def __call__(self, tokens, state):
+        buf = state.env["buf"] = []
+        self._emit(tokens, state)
+        return "".join(buf)
+
+    def _emit(self, tokens, state):
+        """Render tokens straight into the current buffer."""
+        for tok in tokens:
+            self.render_token(tok, state)
+
+    def render_tokens(self, tokens, state):
+        """Render tokens into a scratch buffer and return the joined text.
+
+        Only used by methods that need to inspect their children's output
+        (links, quotes, list items).
+        """
+        outer = state.env["buf"]
+        state.env["buf"] = []
+        self._emit(tokens, state)
+        text = "".join(state.env["buf"])
+        state.env["buf"] = outer
+        return text
+
+    def _wrap(self, token, state, prefix, suffix):
+        buf = state.env["buf"]
+        buf.append(prefix)
+        self._emit(token["children"], state)
+        buf.append(suffix)
+
     def text(self, token, state):
-        return token["raw"]
+        state.env["buf"].append(token["raw"])
 
     def block_text(self, token, state):
         """Render block-level text (used in list items)."""
-        return self.render_tokens(token["children"], state)
+        self._emit(token["children"], state)
 
     def paragraph(self, token, state):
-        text = self.render_tokens(token["children"], state)
-        return f"{text}\n\n"
+        self._wrap(token, state, "", "\n\n")
 
     def heading(self, token, state):
-        text = self.render_tokens(token["children"], state)
         level = token["attrs"]["level"]
-        return f"h{level}. {text}\n\n"
+        self._wrap(token, state, f"h{level}. ", "\n\n")
 
     def emphasis(self, token, state):
-        text = self.render_tokens(token["children"], state)
-        return f"_{text}_"
+        self._wrap(token, state, "_", "_")
 
     def strong(self, token, state):
-        text = self.render_tokens(token["children"], state)
-        return f"*{text}*"
+        self._wrap(token, state, "*", "*")
 
     def codespan(self, token, state):
-        text = token["raw"]
-        return f"{{{{{text}}}}}"
+        buf = state.env["buf"]
+        buf.append("{{")
+        buf.append(token["raw"])
+        buf.append("}}")
 
     def link(self, token, state):
         text = self.render_tokens(token["children"], state)
         url = token["attrs"]["url"]
         if text == url:
-            return f"[{url}]"
-        return f"[{text}|{url}]"
+            state.env["buf"].append(f"[{url}]")
+        else:
+            state.env["buf"].append(f"[{text}|{url}]")
 
     def image(self, token, state):
         url = token["attrs"]["url"]
-        return f"!{url}!"
+        state.env["buf"].append(f"!{url}!")
 
     def block_code(self, token, state):
-        code = token["raw"]
+        buf = state.env["buf"]
         info = token.get("attrs", {}).get("info", "")
-        if info:
-            return f"{{code:language={info}}}\n{code}{{code}}\n\n"
-        return f"{{code}}\n{code}{{code}}\n\n"
+        buf.append(f"{{code:language={info}}}\n" if info else "{code}\n")
+        buf.append(token["raw"])
+        buf.append("{code}\n\n")
 
     def block_quote(self, token, state):
         text = self.render_tokens(token["children"], state)
-        lines = text.strip().split("\n")
-        quoted = "\n".join(f"bq. {line}" for line in lines)
-        return f"{quoted}\n\n"
+        buf = state.env["buf"]
+        for line in text.strip().split("\n"):
+            buf.append(f"bq. {line}\n")
+        buf.append("\n")
 
     def list(self, token, state):
-        body = self.render_tokens(token["children"], state)
-        return body + "\n"
+        # mistune 3 puts "ordered" on the list token, not on its items.
+        # Keep a marker stack so nested lists render as "**", "#*", ...
+        markers = state.env.setdefault("list_marker", [])
+        markers.append("#" if token["attrs"].get("ordered", False) else "*")
+        # A nested list follows its parent item's text on a new line
+        self._wrap(token, state, "\n" if len(markers) > 1 else "", "\n")
+        markers.pop()
 
     def list_item(self, token, state):
         text = self.render_tokens(token["children"], state)
-        # Determine if ordered from parent list
-        ordered = token.get("attrs", {}).get("ordered", False)
-        marker = "#" if ordered else "*"
-        return f"{marker} {text.strip()}\n"
+        marker = "".join(state.env["list_marker"])
+        state.env["buf"].append(f"{marker} {text.strip()}\n")
 
     def newline(self, token, state):
-        return "\n"
+        state.env["buf"].append("\n")
 
     def blank_line(self, token, state):
-        return "\n"
+        state.env["buf"].append("\n")
 
     def linebreak(self, token, state):
-        return "\\\\\n"
+        state.env["buf"].append("\\\\\n")
 
     def thematic_break(self, token, state):
-        return "----\n\n"
+        state.env["buf"].append("----\n\n")
 
     def strikethrough(self, token, state):
-        text = self.render_tokens(token["children"], state)
-        return f"-{text}-"
+        self._wrap(token, state, "-", "-")
 
     def table(self, token, state):
-        text = self.render_tokens(token["children"], state)
-        return f"{text}\n"
+        self._wrap(token, state, "", "\n")
 
     def table_head(self, token, state):
-        text = self.render_tokens(token["children"], state)
-        return text
+        self._emit(token["children"], state)
 
     def table_body(self, token, state):
-        text = self.render_tokens(token["children"], state)
-        return text
+        self._emit(token["children"], state)
 
     def table_row(self, token, state):
-        text = self.render_tokens(token["children"], state)
-        return f"{text}\n"
+        self._wrap(token, state, "", "\n")
 
     def table_cell(self, token, state):
-        text = self.render_tokens(token["children"], state)
         is_head = token.get("attrs", {}).get("head", False)
-        if is_head:
-            return f"||{text}"
-        return f"|{text}"
+        self._wrap(token, state, "||" if is_head else "|", "")
 
 
 def convert_markdown_to_wiki(markdown_text: str) -> str:
@@ -32,10 +32,13 @@ Environment Variables (in .env file or exported):
 
 import sys
 import argparse
+import functools
+import io
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, TextIO
 
 import yaml
 import requests
@@ -49,6 +52,26 @@ from confluence_adf_utils import get_page_adf
 from adf_to_markdown import adf_to_markdown
 import requests as _requests
 
+try:
+    from yaml import CSafeDumper as _YamlDumper  # libyaml-backed
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+# Concurrent REST calls per level when downloading a page tree
+CHILD_DOWNLOAD_WORKERS = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _read_route_decision():
+    """Routing decision for READ, computed once per process.
+
+    Routing only depends on environment credentials, so repeated calls
+    (e.g. when main() is driven in a loop by an orchestrator) reuse it.
+    Not evaluated at import time because route_operation() raises when
+    credentials are missing.
+    """
+    return ConfluenceRouter().route_operation(OperationType.READ)
+
 
 def get_confluence_client(env_file: Optional[str] = None) -> Confluence:
     """Get authenticated Confluence client from environment variables."""
@@ -84,9 +107,12 @@ def sanitize_filename(name: str) -> str:
 
 
 def download_attachments(
-    confluence: Confluence, page_id: str, output_dir: Path
+    confluence: Confluence,
+    page_id: str,
+    output_dir: Path,
+    out: Optional[TextIO] = None,
 ) -> List[str]:
-    """Download all attachments from a page."""
+    """Download all attachments from a page, logging to ``out`` (default stdout)."""
 
     attachments_dir = output_dir / f"{page_id}_attachments"
     downloaded = []
@@ -104,7 +130,7 @@ def download_attachments(
             filename = att["title"]
             download_url = confluence.url + att["_links"]["download"]
 
-            print(f"   📎 {filename}...", end=" ")
+            print(f"   📎 {filename}...", end=" ", file=out)
 
             try:
                 response = requests.get(
@@ -123,13 +149,13 @@ def download_attachments(
                         f.write(chunk)
 
                 downloaded.append(str(file_path))
-                print("✅")
+                print("✅", file=out)
 
             except Exception as e:
-                print(f"❌ {e}")
+                print(f"❌ {e}", file=out)
 
     except Exception as e:
-        print(f"   ⚠️ Could not fetch attachments: {e}")
+        print(f"   ⚠️ Could not fetch attachments: {e}", file=out)
 
     return downloaded
 
@@ -139,6 +165,7 @@ def download_page_v2(
     output_dir: Path,
     confluence: Confluence,
     download_children: bool = False,
+    out: Optional[TextIO] = None,
 ) -> Dict:
     """
     Download a Confluence page to Markdown using v2 API (ADF format).
@@ -146,6 +173,8 @@ def download_page_v2(
     Preserves all Confluence-specific elements (expand, emoji, mention,
     inlineCard, panel, status, date) using custom markers.
 
+    Progress is printed to ``out`` (default stdout).
+
     Returns dict with page info and file path.
     """
     base_url = os.getenv("CONFLUENCE_URL", "")
@@ -170,8 +199,11 @@ def download_page_v2(
     else:
         adf_dict = adf_value
 
-    print(f"\n📄 {title}")
-    print(f"   Space ID: {space_id} | Version: {version_num} | Format: ADF (v2)")
+    print(f"\n📄 {title}", file=out)
+    print(
+        f"   Space ID: {space_id} | Version: {version_num} | Format: ADF (v2)",
+        file=out,
+    )
 
     # Convert ADF to markdown with custom markers
     markdown_content = adf_to_markdown(adf_dict)
@@ -234,14 +266,20 @@ def download_page_v2(
 
     with open(output_file, "w", encoding="utf-8") as f:
         f.write("---\n")
-        yaml.dump(frontmatter, f, default_flow_style=False, allow_unicode=True)
+        yaml.dump(
+            frontmatter,
+            f,
+            Dumper=_YamlDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+        )
         f.write("---\n\n")
         f.write(markdown_content)
 
-    print(f"   ✅ Saved: {output_file}")
+    print(f"   ✅ Saved: {output_file}", file=out)
 
     # Download attachments
-    attachments = download_attachments(confluence, page_id, output_dir)
+    attachments = download_attachments(confluence, page_id, output_dir, out)
 
     result = {
         "id": page_id,
@@ -252,16 +290,49 @@ def download_page_v2(
 
     # Download children if requested
     if download_children:
-        children = confluence.get_page_child_by_type(page_id, type="page")
-        for child in children:
-            child_result = download_page_v2(
-                child["id"], output_dir, confluence, download_children=True
-            )
-            result.setdefault("children", []).append(child_result)
+        download_descendants(result, output_dir, confluence)
 
     return result
 
 
+def download_descendants(root: Dict, output_dir: Path, confluence: Confluence) -> None:
+    """
+    Download every page below ``root`` breadth-first.
+
+    Each level is handled in two concurrent rounds: list the children of
+    all pages at depth N, then download all pages at depth N+1. Results are
+    attached to their parent's ``children`` list in Confluence order.
+
+    Workers buffer their progress output; the main thread prints each page's
+    log in one piece, so lines from concurrent downloads never interleave.
+    """
+
+    def list_children(page: Dict) -> List[Dict]:
+        # get_page_child_by_type pages lazily; materialize inside the worker
+        return list(confluence.get_page_child_by_type(page["id"], type="page"))
+
+    def download(child_id: str) -> tuple[Dict, str]:
+        out = io.StringIO()
+        page = download_page_v2(child_id, output_dir, confluence, out=out)
+        return page, out.getvalue()
+
+    level = [root]
+    with ThreadPoolExecutor(max_workers=CHILD_DOWNLOAD_WORKERS) as pool:
+        while level:
+            pending = [
+                (parent, child["id"])
+                for parent, children in zip(level, pool.map(list_children, level))
+                for child in children
+            ]
+            pages = pool.map(download, [child_id for _, child_id in pending])
+
+            level = []
+            for (parent, _), (page, log) in zip(pending, pages):
+                print(log, end="", flush=True)
+                parent.setdefault("children", []).append(page)
+                level.append(page)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Download Confluence pages to Markdown",
@@ -301,8 +372,7 @@ Examples:
     args = parser.parse_args()
 
     # Display routing decision for transparency
-    router = ConfluenceRouter()
-    decision = router.route_operation(OperationType.READ)
+    decision = _read_route_decision()
     if decision.warning:
         print(decision.warning, file=sys.stderr)
         print()
@@ -21,10 +21,34 @@ Usage:
 import json
 import re
 import uuid
+from functools import lru_cache
 from typing import Any, Optional, Tuple
 
 import mistune
 
+_CUSTOM_MARKER_RE = re.compile(
+    r"<!-- (?:EXPAND:|PANEL:|MENTION:|CARD:|STATUS:|DATE:|ADF:)"
+)
+_CHECKBOX_RE = re.compile(r"^\[[ xX]\]\s")
+
+# Block-level marker comments
+_EXPAND_RE = re.compile(r"^<!-- EXPAND: (.+?) -->$")
+_PANEL_RE = re.compile(r"^<!-- PANEL: (\w+) -->$")
+_ADF_BLOCK_RE = re.compile(r"^<!-- ADF:(\w+) (.+?) -->$")
+_EXPAND_TITLE_RE = re.compile(r'"(.+?)"(.*)')
+_BREAKOUT_RE = re.compile(r'breakout="(\w+)"')
+_WIDTH_RE = re.compile(r'width="(\d+)"')
+
+# Inline markers and HTML
+_HTML_TAG_RE = re.compile(r"^<(u|sub|sup)>$")
+_EMOJI_RE = re.compile(r"(:[a-zA-Z0-9_+\-]+:)")
+_MENTION_RE = re.compile(r'^<!-- MENTION: (\S+) "(.+?)" -->$')
+_CARD_RE = re.compile(r"^<!-- CARD: (.+?) -->$")
+_STATUS_RE = re.compile(r'^<!-- STATUS: "([^"]+)" (\w+) -->$')
+_DATE_RE = re.compile(r"^<!-- DATE: (\d+) -->$")
+_ADF_INLINE_RE = re.compile(r"^<!-- ADF:(\w+) ({.+}) -->$")
+_COMMENT_RE = re.compile(r"<!--.*?-->")
+
 
 def markdown_to_adf(markdown: str) -> dict:
     """
@@ -48,16 +72,19 @@ def has_custom_markers(markdown: str) -> bool:
     Returns True if the markdown was likely produced by adf_to_markdown
     and contains markers for Confluence-specific elements.
     """
-    marker_patterns = [
-        r"<!-- EXPAND:",
-        r"<!-- PANEL:",
-        r"<!-- MENTION:",
-        r"<!-- CARD:",
-        r"<!-- STATUS:",
-        r"<!-- DATE:",
-        r"<!-- ADF:",
-    ]
-    return any(re.search(p, markdown) for p in marker_patterns)
+    return _CUSTOM_MARKER_RE.search(markdown) is not None
+
+
+@lru_cache(maxsize=1)
+def _parser() -> mistune.Markdown:
+    """Build the mistune AST parser once; later calls reuse it.
+
+    mistune keeps all parse state in a per-call BlockState, so the shared
+    instance is safe to use from several threads.
+    """
+    return mistune.create_markdown(
+        renderer="ast", plugins=["table", "strikethrough", "task_lists"]
+    )
 
 
 def _gen_local_id() -> str:
@@ -108,7 +135,7 @@ def _preprocess_markdown(markdown: str) -> str:
         ) and not stripped.startswith("- "):
             out.append(f"- {stripped}")
         # Bare checkbox lines:  [ ] foo  or  [x] bar  (not already list items)
-        elif re.match(r"^\[[ xX]\]\s", stripped) and not stripped.startswith("- "):
+        elif _CHECKBOX_RE.match(stripped) and not stripped.startswith("- "):
             out.append(f"- {stripped}")
         else:
             out.append(line)
@@ -120,10 +147,7 @@ class _MarkdownToADFConverter:
 
     def convert(self, markdown: str) -> dict:
         markdown = _preprocess_markdown(markdown)
-        md = mistune.create_markdown(
-            renderer="ast", plugins=["table", "strikethrough", "task_lists"]
-        )
-        tokens = md(markdown)
+        tokens = _parser()(markdown)
         content = self._convert_tokens(tokens)
 
         if not content:
@@ -139,6 +163,16 @@ class _MarkdownToADFConverter:
         Handles block markers (EXPAND, PANEL, ADF:type) by collecting
         tokens between matching open/close HTML comment markers.
         """
+        # Last position of each closing marker, so an opener with no close
+        # after it (e.g. an ADF leaf marker) is rejected without rescanning
+        # the rest of the document.
+        last_close = {}
+        for i, token in enumerate(tokens):
+            if token.get("type") == "block_html":
+                raw = token.get("raw", "").strip()
+                if raw.startswith("<!-- /"):
+                    last_close[raw] = i
+
         result = []
         i = 0
         while i < len(tokens):
@@ -150,7 +184,7 @@ class _MarkdownToADFConverter:
                 continue
 
             if t == "block_html":
-                node, skip = self._handle_block_html(tokens, i)
+                node, skip = self._handle_block_html(tokens, i, last_close)
                 if node is not None:
                     if isinstance(node, list):
                         result.extend(node)
@@ -169,7 +203,9 @@ class _MarkdownToADFConverter:
 
         return result
 
-    def _handle_block_html(self, tokens: list, idx: int) -> Tuple[Any, int]:
+    def _handle_block_html(
+        self, tokens: list, idx: int, last_close: Optional[dict] = None
+    ) -> Tuple[Any, int]:
         """Handle block_html tokens including marker open/close pairs.
 
         Returns (adf_node_or_None, number_of_tokens_to_advance).
@@ -177,9 +213,9 @@ class _MarkdownToADFConverter:
         raw = tokens[idx].get("raw", "").strip()
 
         # EXPAND marker
-        m = re.match(r"^<!-- EXPAND: (.+?) -->$", raw)
+        m = _EXPAND_RE.match(raw)
         if m:
-            inner, end_i = self._collect_block(tokens, idx + 1, "EXPAND")
+            inner, end_i = self._collect_block(tokens, idx + 1, "EXPAND", last_close)
             if inner is not None:
                 return (
                     self._build_expand(m.group(1), inner),
@@ -188,9 +224,9 @@ class _MarkdownToADFConverter:
             return None, 1
 
         # PANEL marker
-        m = re.match(r"^<!-- PANEL: (\w+) -->$", raw)
+        m = _PANEL_RE.match(raw)
         if m:
-            inner, end_i = self._collect_block(tokens, idx + 1, "PANEL")
+            inner, end_i = self._collect_block(tokens, idx + 1, "PANEL", last_close)
             if inner is not None:
                 return (
                     self._build_panel(m.group(1), inner),
@@ -199,12 +235,12 @@ class _MarkdownToADFConverter:
             return None, 1
 
         # ADF:type marker (block with content, or leaf)
-        m = re.match(r"^<!-- ADF:(\w+) (.+?) -->$", raw)
+        m = _ADF_BLOCK_RE.match(raw)
         if m:
             node_type = m.group(1)
             attrs_str = m.group(2)
             close_tag = f"ADF:{node_type}"
-            inner, end_i = self._collect_block(tokens, idx + 1, close_tag)
+            inner, end_i = self._collect_block(tokens, idx + 1, close_tag, last_close)
             if inner is not None:
                 return (
                     self._build_unknown_block(node_type, attrs_str, inner),
@@ -228,14 +264,17 @@ class _MarkdownToADFConverter:
         return None, 1
 
     def _collect_block(
-        self, tokens: list, start: int, tag: str
+        self, tokens: list, start: int, tag: str, last_close: Optional[dict] = None
     ) -> Tuple[Optional[list], int]:
         """Collect tokens between matching open/close markers.
 
         Returns (inner_tokens, end_index) or (None, -1) if no close found.
-        Handles nesting of same-type markers.
+        Handles nesting of same-type markers. ``last_close`` maps closing
+        markers to their last index in ``tokens``, if the caller has it.
         """
         close_str = f"<!-- /{tag} -->"
+        if last_close is not None and last_close.get(close_str, -1) < start:
+            return None, -1
         open_re = re.compile(r"^<!-- " + re.escape(tag) + r"[: ] .+? -->$")
 
         inner = []
@@ -418,7 +457,7 @@ class _MarkdownToADFConverter:
     def _build_expand(self, attrs_str: str, inner_tokens: list) -> dict:
         """Build ADF expand node from marker attributes and inner tokens."""
         # Parse: "title" breakout="wide" width="1800"
-        title_m = re.match(r'"(.+?)"(.*)', attrs_str.strip())
+        title_m = _EXPAND_TITLE_RE.match(attrs_str.strip())
         title = title_m.group(1) if title_m else attrs_str.strip().strip('"')
         rest = title_m.group(2) if title_m else ""
 
@@ -433,10 +472,10 @@ class _MarkdownToADFConverter:
         }
 
         # Restore breakout marks
-        breakout_m = re.search(r'breakout="(\w+)"', rest)
+        breakout_m = _BREAKOUT_RE.search(rest)
         if breakout_m:
             mark_attrs = {"mode": breakout_m.group(1)}
-            width_m = re.search(r'width="(\d+)"', rest)
+            width_m = _WIDTH_RE.search(rest)
             if width_m:
                 mark_attrs["width"] = int(width_m.group(1))
             node["marks"] = [{"type": "breakout", "attrs": mark_attrs}]
@@ -509,7 +548,7 @@ class _MarkdownToADFConverter:
             token = tokens[i]
             if token.get("type") == "inline_html":
                 raw = token.get("raw", "").strip()
-                tag_m = re.match(r"^<(u|sub|sup)>$", raw)
+                tag_m = _HTML_TAG_RE.match(raw)
                 if tag_m:
                     tag = tag_m.group(1)
                     close_tag = f"</{tag}>"
@@ -626,10 +665,9 @@ class _MarkdownToADFConverter:
         if not text:
             return None
 
-        emoji_re = re.compile(r"(:[a-zA-Z0-9_+\-]+:)")
-        parts = emoji_re.split(text)
+        parts = _EMOJI_RE.split(text) if ":" in text else None
 
-        if len(parts) == 1:
+        if parts is None or len(parts) == 1:
             node = {"type": "text", "text": text}
             if marks:
                 node["marks"] = marks
@@ -639,7 +677,7 @@ class _MarkdownToADFConverter:
         for part in parts:
             if not part:
                 continue
-            if emoji_re.match(part):
+            if _EMOJI_RE.match(part):
                 nodes.append({"type": "emoji", "attrs": {"shortName": part}})
             else:
                 node = {"type": "text", "text": part}
@@ -679,7 +717,7 @@ class _MarkdownToADFConverter:
     def _process_inline_html(self, html: str) -> Any:
         """Parse inline HTML for custom markers."""
         # <!-- MENTION: id "text" -->
-        m = re.match(r'^<!-- MENTION: (\S+) "(.+?)" -->$', html)
+        m = _MENTION_RE.match(html)
         if m:
             return {
                 "type": "mention",
@@ -691,12 +729,12 @@ class _MarkdownToADFConverter:
             }
 
         # <!-- CARD: url -->
-        m = re.match(r"^<!-- CARD: (.+?) -->$", html)
+        m = _CARD_RE.match(html)
         if m:
             return {"type": "inlineCard", "attrs": {"url": m.group(1)}}
 
         # <!-- STATUS: "text" color -->
-        m = re.match(r'^<!-- STATUS: "([^"]+)" (\w+) -->$', html)
+        m = _STATUS_RE.match(html)
         if m:
             return {
                 "type": "status",
@@ -709,12 +747,12 @@ class _MarkdownToADFConverter:
             }
 
         # <!-- DATE: timestamp -->
-        m = re.match(r"^<!-- DATE: (\d+) -->$", html)
+        m = _DATE_RE.match(html)
         if m:
             return {"type": "date", "attrs": {"timestamp": m.group(1)}}
 
         # <!-- ADF:type {...} --> (inline leaf)
-        m = re.match(r"^<!-- ADF:(\w+) ({.+}) -->$", html)
+        m = _ADF_INLINE_RE.match(html)
         if m:
             try:
                 attrs = json.loads(m.group(2))
@@ -743,7 +781,7 @@ class _MarkdownToADFConverter:
         nodes), mistune emits the entire line as one block_html token.
         We split it into individual <!-- ... --> markers and process each.
         """
-        parts = re.findall(r"<!--.*?-->", html)
+        parts = _COMMENT_RE.findall(html)
         if len(parts) < 2:
             return None
 
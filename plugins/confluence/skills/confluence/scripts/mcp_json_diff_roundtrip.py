@@ -4,6 +4,7 @@
 # dependencies = [
 #   "requests>=2.31.0",
 #   "python-dotenv>=1.0.0",
+#   "orjson>=3.9.0",
 # ]
 # ///
 """
@@ -24,23 +25,166 @@ Usage:
     from mcp_json_diff_roundtrip import MCPJsonDiffRoundtrip, BackupManager
 """
 
+import io
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is used as a fallback
+    orjson = None
 
 sys.path.insert(0, str(Path(__file__).parent))
 from confluence_adf_utils import get_auth, get_page_adf, update_page_adf
 
+# Inline formatting stripped by TextDiffer: bold italic, bold, italic, code
+_RE_INLINE = re.compile(r"\*\*\*(.+?)\*\*\*|\*\*(.+?)\*\*|\*(.+?)\*|`(.+?)`")
+
+# Trailing "<!-- NODE: n -->" comment tying a Markdown line to text node n
+_RE_NODE_ANCHOR = re.compile(r"\s*<!-- NODE: (\d+) -->$")
+
+# Inline "<!-- MACRO: id -->" marking a macro nested inside a block's text
+_RE_MACRO_PLACEHOLDER = re.compile(r"\s*<!-- MACRO: .*? -->")
+
+
+def _strip_block_marker(line: str) -> str:
+    """Remove a leading header, list, or blockquote marker from a stripped line."""
+    first = line[0]
+    if first == "#":
+        end = len(line) - len(line.lstrip("#"))
+        if end > 6:
+            return line
+    elif first in "-*+>":
+        end = 1
+    elif first in "0123456789":
+        end = len(line) - len(line.lstrip("0123456789"))
+        if line[end : end + 1] != ".":
+            return line
+        end += 1
+    else:
+        return line
+
+    # The marker only counts when followed by whitespace
+    if line[end : end + 1].isspace():
+        return line[end:].lstrip()
+    return line
+
+
+def _strip_inline_match(match: re.Match) -> str:
+    """Replacement for _RE_INLINE: keep the inner text (code spans verbatim)."""
+    code = match.group(4)
+    if code is not None:
+        return code
+    inner = next(group for group in match.groups() if group is not None)
+    return _RE_INLINE.sub(_strip_inline_match, inner)
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize backup data to UTF-8 JSON bytes (C encoder either way)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_compact(data: Any) -> bytes:
+    """Serialize to compact single-line UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _dumps_body(data: Any) -> str:
+    """Serialize an ADF page body to compact JSON text."""
+    return _dumps_compact(data).decode("utf-8")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to a temp file and rename it over ``path``."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _loads_json(raw: str | bytes) -> Any:
+    """Parse JSON text with orjson when available."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _load_json(path: Path) -> Any:
+    """Read a JSON file written by _dump_json."""
+    return _loads_json(path.read_bytes())
+
+
+# ADF node types that represent macros/special structures
+_MACRO_NODE_TYPES = frozenset(
+    {"inlineExtension", "extension", "bodiedExtension", "panel", "expand"}
+)
+
+# Macro node types identified by attrs["extensionKey"]
+_EXTENSION_NODE_TYPES = frozenset({"inlineExtension", "extension", "bodiedExtension"})
+
+# Map of macro identifiers to friendly names
+_MACRO_TYPE_NAMES = {
+    "expand": "Expand Panel",
+    "panel": "Panel",
+    "info": "Info Panel",
+    "note": "Note Panel",
+    "warning": "Warning Panel",
+    "tip": "Tip Panel",
+    "success": "Success Panel",
+    "error": "Error Panel",
+}
+
+# Shared stand-in for nodes without "attrs" (read-only, never mutated), so
+# attr-less nodes don't allocate a fresh {} on every visit. Node type strings
+# are compared with == rather than interned and compared with `is`: json.loads
+# does not intern string values, so identity checks would silently fail.
+_EMPTY_ATTRS: dict = {}
+
+
+def _is_macro(
+    node_type: str | None, attrs: dict, _macro_types=_MACRO_NODE_TYPES
+) -> bool:
+    """Check whether a node is a macro (by type or by macro-specific attributes)."""
+    return (
+        node_type in _macro_types
+        or "extensionKey" in attrs
+        or "panelType" in attrs  # For panel nodes
+    )
+
+
+def _macro_identifier(node_type: str | None, attrs: dict) -> str:
+    """Identify a macro node: extension key, panel type, or node type."""
+    if node_type in _EXTENSION_NODE_TYPES:
+        return attrs.get("extensionKey") or node_type
+    if node_type == "panel":
+        return attrs.get("panelType") or node_type
+    if node_type == "expand":
+        return node_type
+    # Flagged as a macro by its attrs alone
+    return attrs.get("extensionKey") or attrs.get("panelType") or node_type
+
+
+def _format_path(path: tuple[str | int, ...]) -> str:
+    """Render a node path for messages, e.g. content[0].content[2]."""
+    return "".join(
+        f"[{part}]" if isinstance(part, int) else f".{part}" for part in path
+    ).lstrip(".")
+
 
 @dataclass
 class TextNode:
     """Represents a text node with its JSON path."""
 
-    path: str  # JSON path like "content.0.content.1.text"
+    path: tuple[str | int, ...]  # JSON path like ("content", 0, "content", 1, "text")
     text: str
 
 
@@ -48,12 +192,12 @@ class TextNode:
 class TextChange:
     """Represents a text change to apply."""
 
-    path: str
+    path: tuple[str | int, ...]
     old_text: str
     new_text: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MacroInfo:
     """Information about a detected macro with editable content."""
 
@@ -62,17 +206,21 @@ class MacroInfo:
     text_count: int  # Number of text nodes inside
 
 
+@dataclass
+class ADFWalkResult:
+    """Everything edit_page needs from one pass over an ADF document."""
+
+    text_nodes: list[TextNode]
+    markdown: str
+    macros: list[MacroInfo]
+    errors: list[str] = field(default_factory=list)  # Invalid nodes seen on the way
+
+
 class ADFTextExtractor:
     """Extracts and patches text nodes from Atlassian Document Format (ADF)."""
 
     # Node types that represent macros/special structures
-    MACRO_NODE_TYPES = {
-        "inlineExtension",
-        "extension",
-        "bodiedExtension",
-        "panel",
-        "expand",
-    }
+    MACRO_NODE_TYPES = _MACRO_NODE_TYPES
 
     def __init__(self, skip_macro_bodies: bool = True):
         """
@@ -95,51 +243,46 @@ class ADFTextExtractor:
             List of TextNode objects with paths and text
         """
         text_nodes = []
-        self._extract_recursive(adf, "", text_nodes, inside_macro=False)
-        return text_nodes
-
-    def _extract_recursive(
-        self, node: Any, path: str, text_nodes: list[TextNode], inside_macro: bool
-    ) -> None:
-        """Recursively extract text nodes from ADF structure."""
-        if not isinstance(node, dict):
-            return
+        skip_macro_bodies = self.skip_macro_bodies
+
+        # Depth-first walk with an explicit stack; children are pushed in
+        # reverse so they are visited in document order.
+        stack = [(adf, (), False)]
+        while stack:
+            node, path, inside_macro = stack.pop()
+            if not isinstance(node, dict):
+                continue
 
-        node_type = node.get("type")
-        attrs = node.get("attrs", {})
+            node_type = node.get("type")
+            is_macro = _is_macro(node_type, node.get("attrs") or _EMPTY_ATTRS)
 
-        # Check if this is a macro node (by type or by special attributes)
-        is_macro = (
-            node_type in self.MACRO_NODE_TYPES
-            or "extensionKey" in attrs
-            or "panelType" in attrs  # For panel nodes
-        )
-
-        # Decide whether to skip this subtree
-        if is_macro and self.skip_macro_bodies:
             # Skip entire macro subtree in Safe Mode
-            return
+            if is_macro and skip_macro_bodies:
+                continue
 
-        # If this is a text node, extract it (unless we're inside a macro in Safe Mode)
-        if node_type == "text" and not (inside_macro and self.skip_macro_bodies):
-            text = node.get("text", "")
-            if text.strip():  # Only include non-empty text
-                text_path = f"{path}.text" if path else "text"
-                text_nodes.append(TextNode(path=text_path, text=text))
+            # If this is a text node, extract it (unless inside a macro in Safe Mode)
+            if node_type == "text" and not (inside_macro and skip_macro_bodies):
+                text = node.get("text", "")
+                if text.strip():  # Only include non-empty text
+                    text_nodes.append(TextNode(path=path + ("text",), text=text))
 
-        # Recurse into content array
-        content = node.get("content")
-        if isinstance(content, list):
-            for i, child in enumerate(content):
-                child_path = f"{path}.content.{i}" if path else f"content.{i}"
-                self._extract_recursive(
-                    child, child_path, text_nodes, inside_macro=is_macro or inside_macro
+            content = node.get("content")
+            if isinstance(content, list):
+                child_inside = is_macro or inside_macro
+                stack.extend(
+                    (content[i], path + ("content", i), child_inside)
+                    for i in range(len(content) - 1, -1, -1)
                 )
 
+        return text_nodes
+
     def apply_text_changes(self, adf: dict, changes: list[TextChange]) -> dict:
         """
         Apply text changes to ADF by path.
 
+        Only the dicts/lists along each changed path are copied; every
+        untouched subtree is shared by reference with the original.
+
         Args:
             adf: Original ADF structure
             changes: List of text changes to apply
@@ -147,31 +290,30 @@ class ADFTextExtractor:
         Returns:
             Modified ADF structure (original is not mutated)
         """
-        # Deep copy to avoid mutating original
-        import copy
-
-        result = copy.deepcopy(adf)
+        result = dict(adf)
+        # ids of containers already copied for this result, so changes that
+        # share a path prefix copy each ancestor only once
+        copied = {id(result)}
 
         for change in changes:
-            self._apply_change(result, change)
+            self._apply_change(result, change, copied)
 
         return result
 
-    def _apply_change(self, adf: dict, change: TextChange) -> None:
-        """Apply a single text change by navigating the path."""
-        path_parts = change.path.split(".")
-
-        # Navigate to parent node
+    def _apply_change(self, adf: dict, change: TextChange, copied: set[int]) -> None:
+        """Apply a single text change, copying each container on the path."""
+        # Navigate to parent node, copying it on first visit
         current = adf
-        for part in path_parts[:-1]:
-            if part.isdigit():
-                current = current[int(part)]
-            else:
-                current = current[part]
+        for key in change.path[:-1]:
+            child = current[key]
+            if id(child) not in copied:
+                child = child.copy()
+                current[key] = child
+                copied.add(id(child))
+            current = child
 
         # Apply change to text field
-        last_part = path_parts[-1]
-        if last_part == "text":
+        if change.path[-1] == "text":
             current["text"] = change.new_text
 
 
@@ -207,18 +349,15 @@ class SimpleMarkdownConverter:
             return
 
         node_type = node.get("type")
+        attrs = node.get("attrs") or _EMPTY_ATTRS
+        content = node.get("content")
 
         # Check if this is a macro
-        attrs = node.get("attrs", {})
-        is_macro = (
-            node_type in ADFTextExtractor.MACRO_NODE_TYPES
-            or "extensionKey" in attrs
-            or "panelType" in attrs
-        )
+        is_macro = _is_macro(node_type, attrs)
 
         if is_macro:
             # Insert placeholder comment with macro identifier
-            macro_id = attrs.get("extensionKey") or attrs.get("panelType") or node_type
+            macro_id = _macro_identifier(node_type, attrs)
             lines.append(f"\n<!-- MACRO: {macro_id} -->\n")
 
             if not include_macro_bodies:
@@ -227,66 +366,88 @@ class SimpleMarkdownConverter:
 
         # Convert based on node type
         if node_type == "heading":
-            level = node.get("attrs", {}).get("level", 1)
-            text = self._extract_text(node)
+            level = attrs.get("level", 1)
+            text = self._extract_text(node, include_macro_bodies)
             lines.append(f"{'#' * level} {text}")
 
         elif node_type == "paragraph":
-            text = self._extract_text(node)
+            text = self._extract_text(node, include_macro_bodies)
             if text.strip():
                 lines.append(text)
                 lines.append("")  # Add blank line after paragraph
 
         elif node_type == "bulletList":
-            self._convert_list(node, lines, ordered=False)
+            self._convert_list(node, lines, False, include_macro_bodies)
 
         elif node_type == "orderedList":
-            self._convert_list(node, lines, ordered=True)
+            self._convert_list(node, lines, True, include_macro_bodies)
 
         elif node_type == "codeBlock":
-            language = node.get("attrs", {}).get("language", "")
-            text = self._extract_text(node)
+            language = attrs.get("language", "")
+            text = self._extract_text(node, include_macro_bodies)
             lines.append(f"```{language}")
             lines.append(text)
             lines.append("```")
             lines.append("")
 
         elif node_type == "blockquote":
-            text = self._extract_text(node)
+            text = self._extract_text(node, include_macro_bodies)
             for line in text.split("\n"):
                 lines.append(f"> {line}")
             lines.append("")
 
         elif node_type == "doc":
             # Document root - process content
-            content = node.get("content", [])
-            for child in content:
+            for child in content or ():
                 self._convert_recursive(
                     child, lines, inside_macro, include_macro_bodies
                 )
 
         # For other types, just recurse into content
-        elif "content" in node:
-            for child in node["content"]:
+        elif content is not None:
+            for child in content:
                 self._convert_recursive(
                     child, lines, is_macro or inside_macro, include_macro_bodies
                 )
 
-    def _extract_text(self, node: dict) -> str:
-        """Extract all text from a node and its children."""
-        if node.get("type") == "text":
-            return node.get("text", "")
+    def _extract_text(self, node: dict, include_macro_bodies: bool = True) -> str:
+        """Extract all text from a node and its children.
+
+        In Safe Mode a nested macro is replaced by an inline placeholder.
+        """
+        # Collect every text node in one top-down pass and join once, rather
+        # than joining a string per ancestor on the way back up.
+        texts = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.get("type") == "text":
+                texts.append(node.get("text", ""))
+                continue
+
+            attrs = node.get("attrs") or _EMPTY_ATTRS
+            if not include_macro_bodies and _is_macro(node.get("type"), attrs):
+                macro_id = _macro_identifier(node.get("type"), attrs)
+                texts.append(f" <!-- MACRO: {macro_id} -->")
+                continue
 
-        content = node.get("content", [])
-        texts = [self._extract_text(child) for child in content]
+            content = node.get("content")
+            if content:
+                stack.extend(reversed(content))
         return "".join(texts)
 
-    def _convert_list(self, node: dict, lines: list[str], ordered: bool) -> None:
+    def _convert_list(
+        self,
+        node: dict,
+        lines: list[str],
+        ordered: bool,
+        include_macro_bodies: bool = True,
+    ) -> None:
         """Convert a list node to Markdown."""
-        items = node.get("content", [])
+        items = node.get("content") or ()
         for i, item in enumerate(items):
             prefix = f"{i + 1}." if ordered else "-"
-            text = self._extract_text(item)
+            text = self._extract_text(item, include_macro_bodies)
             lines.append(f"{prefix} {text}")
         lines.append("")
 
@@ -316,107 +477,141 @@ class TextDiffer:
         Returns:
             List of TextChange objects
         """
-        # Extract text lines from markdown (ignore markdown syntax)
-        edited_texts = self._extract_text_from_markdown(edited_markdown)
+        # Extract text lines from markdown (ignore markdown syntax). Lines
+        # still carrying their NODE anchor map straight to that node; the
+        # rest go through word-overlap matching.
+        anchored: dict[int, str] = {}
+        edited_texts = []
+        for anchor, text in self._iter_markdown_texts(edited_markdown):
+            if anchor is None or anchor >= len(original_nodes) or anchor in anchored:
+                edited_texts.append(text)
+                continue
+
+            node_text = original_nodes[anchor].text
+            if text == node_text or (
+                self._word_overlap(node_text, text) >= self.overlap_threshold
+            ):
+                anchored[anchor] = text
+            else:
+                # Rewritten beyond recognition: let fuzzy matching decide
+                edited_texts.append(text)
+
+        # Word sets are computed once per text, and an inverted index
+        # (word -> edited line indices) limits each node's comparisons to
+        # lines that share at least one word with it.
+        edited_words = [set(text.lower().split()) for text in edited_texts]
+        word_index: dict[str, list[int]] = {}
+        for i, words in enumerate(edited_words):
+            for word in words:
+                word_index.setdefault(word, []).append(i)
 
         changes = []
         used_edited = set()
 
         # Match each original text node with edited text
-        for node in original_nodes:
+        for idx, node in enumerate(original_nodes):
+            if idx in anchored:
+                if anchored[idx] != node.text:
+                    changes.append(
+                        TextChange(
+                            path=node.path, old_text=node.text, new_text=anchored[idx]
+                        )
+                    )
+                continue
+
+            node_words = set(node.text.lower().split())
+            shared_counts = Counter()
+            for word in node_words:
+                shared_counts.update(word_index.get(word, ()))
+
             best_match = None
             best_overlap = 0.0
 
-            for i, edited_text in enumerate(edited_texts):
+            # Ascending index order keeps the earliest line on ties
+            for i in sorted(shared_counts):
                 if i in used_edited:
                     continue
 
-                overlap = self._compute_word_overlap(node.text, edited_text)
+                # Jaccard overlap from set sizes: |A & B| / |A | B|
+                shared = shared_counts[i]
+                overlap = shared / (len(node_words) + len(edited_words[i]) - shared)
                 if overlap > best_overlap and overlap >= self.overlap_threshold:
                     best_overlap = overlap
-                    best_match = (i, edited_text)
+                    best_match = i
 
-            if best_match and best_match[1] != node.text:
+            if best_match is not None and edited_texts[best_match] != node.text:
                 # Text changed
                 changes.append(
                     TextChange(
-                        path=node.path, old_text=node.text, new_text=best_match[1]
+                        path=node.path,
+                        old_text=node.text,
+                        new_text=edited_texts[best_match],
                     )
                 )
-                used_edited.add(best_match[0])
+                used_edited.add(best_match)
 
         return changes
 
     def _extract_text_from_markdown(self, markdown: str) -> list[str]:
         """Extract plain text lines from markdown (strip formatting)."""
-        texts = []
+        return [text for _, text in self._iter_markdown_texts(markdown)]
 
-        for line in markdown.split("\n"):
+    def _iter_markdown_texts(self, markdown: str) -> Iterator[tuple[int | None, str]]:
+        """Yield (node anchor or None, plain text) for each markdown text line."""
+        # Iterate lines lazily instead of materializing markdown.split("\n");
+        # strip() also drops each line's trailing newline
+        for line in io.StringIO(markdown):
             line = line.strip()
 
             # Skip empty lines and macro comments
             if not line or line.startswith("<!--"):
                 continue
 
+            anchor = None
+            if line.endswith("-->"):
+                match = _RE_NODE_ANCHOR.search(line)
+                if match:
+                    anchor = int(match.group(1))
+                    line = line[: match.start()]
+
             # Strip markdown formatting
-            # Remove headers
-            line = re.sub(r"^#{1,6}\s+", "", line)
-            # Remove list markers
-            line = re.sub(r"^[-*+]\s+", "", line)
-            line = re.sub(r"^\d+\.\s+", "", line)
-            # Remove blockquote markers
-            line = re.sub(r"^>\s+", "", line)
+            # Remove header, list, or blockquote markers
+            line = _strip_block_marker(line)
+            # Drop inline placeholders for nested macros
+            if "<!-- MACRO:" in line:
+                line = _RE_MACRO_PLACEHOLDER.sub("", line).strip()
             # Remove code block markers
             if line.startswith("```"):
                 continue
 
-            # Remove inline formatting (bold, italic, code)
-            line = re.sub(r"\*\*(.+?)\*\*", r"\1", line)
-            line = re.sub(r"\*(.+?)\*", r"\1", line)
-            line = re.sub(r"`(.+?)`", r"\1", line)
+            # Remove inline formatting (bold, italic, code) in one pass,
+            # only when the line can contain any
+            if "*" in line or "`" in line:
+                line = _RE_INLINE.sub(_strip_inline_match, line)
 
             if line:
-                texts.append(line)
+                yield anchor, line
 
-        return texts
-
-    def _compute_word_overlap(self, text1: str, text2: str) -> float:
-        """Compute word overlap ratio between two texts."""
+    @staticmethod
+    def _word_overlap(text1: str, text2: str) -> float:
+        """Compute word overlap ratio (Jaccard) between two texts."""
         words1 = set(text1.lower().split())
         words2 = set(text2.lower().split())
 
         if not words1 or not words2:
             return 0.0
 
-        overlap = len(words1 & words2)
-        total = len(words1 | words2)
-
-        return overlap / total if total > 0 else 0.0
+        return len(words1 & words2) / len(words1 | words2)
 
 
 class MacroBodyDetector:
     """Detects and analyzes macros with editable content."""
 
     # Map of macro identifiers to friendly names
-    MACRO_TYPES = {
-        "expand": "Expand Panel",
-        "panel": "Panel",
-        "info": "Info Panel",
-        "note": "Note Panel",
-        "warning": "Warning Panel",
-        "tip": "Tip Panel",
-        "success": "Success Panel",
-        "error": "Error Panel",
-    }
+    MACRO_TYPES = _MACRO_TYPE_NAMES
 
     # ADF node types that represent macros
-    MACRO_NODE_TYPES = {
-        "panel",
-        "expand",
-        "inlineExtension",
-        "extension",
-        "bodiedExtension",
-    }
+    MACRO_NODE_TYPES = _MACRO_NODE_TYPES
 
     def detect_macros_with_content(self, adf: dict) -> list[MacroInfo]:
         """
@@ -438,20 +633,13 @@ class MacroBodyDetector:
             return
 
         node_type = node.get("type")
+        attrs = node.get("attrs") or _EMPTY_ATTRS
 
         # Check if this is a macro node
-        is_macro = node_type in self.MACRO_NODE_TYPES
+        is_macro = _is_macro(node_type, attrs)
 
         if is_macro:
-            # Get macro identifier
-            attrs = node.get("attrs", {})
-
-            # Try different ways to identify macro type
-            macro_identifier = (
-                attrs.get("extensionKey")  # For extension nodes
-                or attrs.get("panelType")  # For panel nodes
-                or node_type  # Fallback to node type
-            )
+            macro_identifier = _macro_identifier(node_type, attrs)
 
             # Count text nodes inside
             text_count = self._count_text_nodes(node)
@@ -461,7 +649,7 @@ class MacroBodyDetector:
                 preview = self._extract_preview(node)
 
                 # Get friendly name
-                macro_type = self.MACRO_TYPES.get(
+                macro_type = _MACRO_TYPE_NAMES.get(
                     macro_identifier, macro_identifier.title()
                 )
 
@@ -471,27 +659,28 @@ class MacroBodyDetector:
 
         # Recurse into content (don't recurse if we already processed this macro)
         if not is_macro:
-            content = node.get("content", [])
+            content = node.get("content")
             if isinstance(content, list):
                 for child in content:
                     self._detect_recursive(child, macros)
 
     def _count_text_nodes(self, node: Any) -> int:
         """Count text nodes inside a macro."""
-        if not isinstance(node, dict):
-            return 0
-
         count = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, dict):
+                continue
 
-        if node.get("type") == "text":
-            text = node.get("text", "")
-            if text.strip():
-                count += 1
+            if node.get("type") == "text":
+                text = node.get("text", "")
+                if text.strip():
+                    count += 1
 
-        content = node.get("content", [])
-        if isinstance(content, list):
-            for child in content:
-                count += self._count_text_nodes(child)
+            content = node.get("content")
+            if isinstance(content, list):
+                stack.extend(content)
 
         return count
 
@@ -503,20 +692,284 @@ class MacroBodyDetector:
         return text[:max_chars] + "..."
 
     def _extract_all_text(self, node: Any) -> str:
-        """Extract all text from a node."""
+        """Extract all text from a node, space-separated in document order."""
+        texts = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, dict):
+                continue
+
+            if node.get("type") == "text":
+                text = node.get("text", "")
+                if text:
+                    texts.append(text)
+                continue
+
+            content = node.get("content")
+            if isinstance(content, list):
+                stack.extend(reversed(content))
+
+        return " ".join(texts)
+
+
+class UnifiedADFWalker:
+    """
+    Extracts text nodes, Markdown, and macro info from ADF in a single pass.
+
+    Produces the same results as ADFTextExtractor, SimpleMarkdownConverter and
+    MacroBodyDetector combined, but classifies and visits each node only once.
+    Node-level validation (text fields, macro attrs) happens during the same
+    walk; ADFValidator only checks the document root.
+    """
+
+    def walk(
+        self, adf: dict, include_macro_bodies: bool = False, node_anchors: bool = True
+    ) -> ADFWalkResult:
+        """
+        Walk ADF once and collect text nodes, Markdown, and macros.
+
+        Args:
+            adf: ADF JSON structure
+            include_macro_bodies: If True, include macro body text (Advanced Mode)
+            node_anchors: If True, end each line that holds exactly one text
+                node with a ``<!-- NODE: n -->`` comment (n = index into
+                text_nodes) so TextDiffer can map it back without guessing
+
+        Returns:
+            ADFWalkResult with text nodes, Markdown string, detected macros, and
+            validation errors for the nodes visited
+        """
+        lines = []
+        text_nodes = []
+        macros = []
+        errors = []
+        self._walk(
+            adf,
+            (),
+            lines,
+            text_nodes,
+            macros,
+            errors,
+            inside_macro=False,
+            include_bodies=include_macro_bodies,
+            node_anchors=node_anchors,
+        )
+        return ADFWalkResult(
+            text_nodes=text_nodes,
+            markdown="\n".join(lines),
+            macros=macros,
+            errors=errors,
+        )
+
+    def _walk(
+        self,
+        node: Any,
+        path: tuple[str | int, ...],
+        lines: list[str],
+        text_nodes: list[TextNode],
+        macros: list[MacroInfo],
+        errors: list[str],
+        inside_macro: bool,
+        include_bodies: bool,
+        node_anchors: bool,
+        text: list[str] | None = None,
+        body: list[str] | None = None,
+    ) -> None:
+        """
+        Visit one node.
+
+        ``text`` collects the flattened text of the enclosing heading/paragraph/
+        list item/code block/blockquote (None at block level); ``body`` collects
+        the text of the enclosing top-level macro for its MacroInfo.
+        """
         if not isinstance(node, dict):
-            return ""
+            return
+
+        node_type = node.get("type")
+        attrs = node.get("attrs") or _EMPTY_ATTRS
+        content = node.get("content")
+
+        is_macro = _is_macro(node_type, attrs)
+
+        if node_type == "text":
+            value = node.get("text")
+            if not isinstance(value, str):
+                problem = (
+                    "missing 'text' field"
+                    if "text" not in node
+                    else "'text' must be string"
+                )
+                errors.append(f"Text node at {_format_path(path)} {problem}")
+                value = ""
+            if value.strip():
+                text_nodes.append(TextNode(path=path + ("text",), text=value))
+            if text is not None:
+                text.append(value)
+            if body is not None:
+                body.append(value)
+
+        top_level_macro = is_macro and not inside_macro
+        if is_macro:
+            if node_type in _MACRO_NODE_TYPES and "attrs" not in node:
+                errors.append(
+                    f"Macro node at {_format_path(path)} missing 'attrs' field"
+                )
+
+            macro_id = _macro_identifier(node_type, attrs)
+            if text is None:
+                lines.append(f"\n<!-- MACRO: {macro_id} -->\n")
+            elif not include_bodies:
+                # Nested in a block: its body is hidden, so mark it inline
+                text.append(f" <!-- MACRO: {macro_id} -->")
+
+            if not include_bodies:
+                # Safe Mode: leave the body alone, but still report the macro
+                body_texts = []
+                self._collect_texts(node, body_texts)
+                self._add_macro(macro_id, body_texts, macros)
+                return
+
+            if top_level_macro:
+                body = []
+
+        if not isinstance(content, list):
+            content = []
+
+        args = (
+            lines,
+            text_nodes,
+            macros,
+            errors,
+            is_macro or inside_macro,
+            include_bodies,
+            node_anchors,
+        )
+        first = len(text_nodes)  # index of this block's first text node
+
+        if text is not None:
+            # Already inside a block: just gather its text
+            self._walk_children(content, path, args, text, body)
+
+        elif node_type == "heading":
+            level = attrs.get("level", 1)
+            block_text = []
+            self._walk_children(content, path, args, block_text, body)
+            joined = "".join(block_text)
+            anchor = self._anchor(text_nodes, first, joined, node_anchors)
+            lines.append(f"{'#' * level} {joined}{anchor}")
+
+        elif node_type == "paragraph":
+            block_text = []
+            self._walk_children(content, path, args, block_text, body)
+            joined = "".join(block_text)
+            if joined.strip():
+                lines.append(
+                    joined + self._anchor(text_nodes, first, joined, node_anchors)
+                )
+                lines.append("")  # Add blank line after paragraph
+
+        elif node_type in ("bulletList", "orderedList"):
+            ordered = node_type == "orderedList"
+            for i, item in enumerate(content):
+                item_text = []
+                first = len(text_nodes)
+                self._walk(item, path + ("content", i), *args, item_text, body)
+                prefix = f"{i + 1}." if ordered else "-"
+                joined = "".join(item_text)
+                anchor = self._anchor(text_nodes, first, joined, node_anchors)
+                lines.append(f"{prefix} {joined}{anchor}")
+            lines.append("")
+
+        elif node_type == "codeBlock":
+            block_text = []
+            self._walk_children(content, path, args, block_text, body)
+            lines.append(f"```{attrs.get('language', '')}")
+            lines.append("".join(block_text))
+            lines.append("```")
+            lines.append("")
+
+        elif node_type == "blockquote":
+            block_text = []
+            self._walk_children(content, path, args, block_text, body)
+            joined = "".join(block_text)
+            anchor = self._anchor(text_nodes, first, joined, node_anchors)
+            for line in joined.split("\n"):
+                lines.append(f"> {line}{anchor}")
+            lines.append("")
+
+        else:
+            # Document root and container nodes: recurse at block level
+            self._walk_children(content, path, args, None, body)
 
-        if node.get("type") == "text":
-            return node.get("text", "")
+        if top_level_macro:
+            self._add_macro(macro_id, body, macros)
 
-        content = node.get("content", [])
-        if isinstance(content, list):
-            texts = [self._extract_all_text(child) for child in content]
-            return " ".join(t for t in texts if t)
+    def _walk_children(
+        self,
+        content: list,
+        path: tuple[str | int, ...],
+        args: tuple,
+        text: list[str] | None,
+        body: list[str] | None,
+    ) -> None:
+        """Walk each child of a content array."""
+        for i, child in enumerate(content):
+            self._walk(child, path + ("content", i), *args, text, body)
 
+    @staticmethod
+    def _anchor(
+        text_nodes: list[TextNode], first: int, block_text: str, enabled: bool
+    ) -> str:
+        """NODE anchor for a line whose text is exactly one text node, else ""."""
+        if "<!--" in block_text:
+            block_text = _RE_MACRO_PLACEHOLDER.sub("", block_text)
+        if (
+            enabled
+            and len(text_nodes) == first + 1
+            and text_nodes[first].text == block_text
+            and "\n" not in block_text
+        ):
+            return f" <!-- NODE: {first} -->"
         return ""
 
+    def _collect_texts(self, node: Any, texts: list[str]) -> None:
+        """Collect the text of every text node under ``node``, in document order."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, dict):
+                continue
+
+            if node.get("type") == "text":
+                text = node.get("text")
+                if isinstance(text, str):
+                    texts.append(text)
+
+            content = node.get("content")
+            if isinstance(content, list):
+                stack.extend(reversed(content))
+
+    def _add_macro(
+        self,
+        macro_identifier: str,
+        body_texts: list[str],
+        macros: list[MacroInfo],
+    ) -> None:
+        """Record a macro if its body has editable text."""
+        text_count = sum(1 for t in body_texts if t.strip())
+        if text_count == 0:
+            return
+
+        preview = " ".join(t for t in body_texts if t)
+        if len(preview) > 50:
+            preview = preview[:50] + "..."
+
+        macro_type = _MACRO_TYPE_NAMES.get(macro_identifier, macro_identifier.title())
+        macros.append(
+            MacroInfo(type=macro_type, preview=preview, text_count=text_count)
+        )
+
 
 class BackupManager:
     """Manages backups and rollbacks for Confluence pages."""
@@ -531,6 +984,15 @@ class BackupManager:
         """
         self.backup_dir = backup_dir or Path(".confluence_backups")
         self.retention_limit = retention_limit
+        # Backup files per page (newest first) with the page directory's mtime
+        # when scanned; kept in sync as this manager creates and prunes
+        # backups, and rescanned once the directory changes (another manager
+        # or process may write to it too)
+        self._listing_cache: dict[str, tuple[int, list[Path]]] = {}
+        # Rows in each page's append-only metadata log (meta.jsonl), counted
+        # once so the log can be compacted when pruned rows pile up
+        self._meta_rows: dict[str, int] = {}
+        self._lock = threading.Lock()
 
     def create_backup(
         self, page_id: str, adf_content: dict, version: int, title: str, space_id: str
@@ -566,12 +1028,27 @@ class BackupManager:
             "adf_content": adf_content,
         }
 
-        # Write backup
-        with open(backup_file, "w", encoding="utf-8") as f:
-            json.dump(backup_data, f, indent=2, ensure_ascii=False)
+        # Write backup atomically (rollback must never read a torn file)
+        _write_atomic(backup_file, _dump_json(backup_data))
+
+        with self._lock:
+            backups = self._page_backups(page_id)
+            if backup_file not in backups:  # the first scan may have seen it
+                # Usually the front, but concurrent backups can finish out of
+                # timestamp order
+                index = next(
+                    (i for i, f in enumerate(backups) if f < backup_file),
+                    len(backups),
+                )
+                backups.insert(index, backup_file)
 
-        # Cleanup old backups
-        self._cleanup_old_backups(page_id)
+            # Cleanup old backups
+            self._cleanup_old_backups(page_id)
+
+            # One metadata row per backup, so listing never parses the ADF
+            self._append_meta(
+                page_id, {"timestamp": timestamp, "title": title, "version": version}
+            )
 
         return backup_file
 
@@ -586,24 +1063,19 @@ class BackupManager:
         Returns:
             Backup data dict
         """
-        page_backup_dir = self.backup_dir / page_id
-
-        if not page_backup_dir.exists():
-            raise FileNotFoundError(f"No backups found for page {page_id}")
-
         if timestamp:
-            backup_file = page_backup_dir / f"{timestamp}.json"
+            backup_file = self.backup_dir / page_id / f"{timestamp}.json"
             if not backup_file.exists():
                 raise FileNotFoundError(f"Backup not found: {timestamp}")
         else:
-            # Get latest backup
-            backups = sorted(page_backup_dir.glob("*.json"), reverse=True)
-            if not backups:
-                raise FileNotFoundError(f"No backups found for page {page_id}")
-            backup_file = backups[0]
+            with self._lock:
+                backups = self._page_backups(page_id)
+                if not backups:
+                    raise FileNotFoundError(f"No backups found for page {page_id}")
+                # Get latest backup
+                backup_file = backups[0]
 
-        with open(backup_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _load_json(backup_file)
 
     def list_backups(self, page_id: str) -> list[dict]:
         """
@@ -615,33 +1087,92 @@ class BackupManager:
         Returns:
             List of backup info dicts (timestamp, title, version)
         """
-        page_backup_dir = self.backup_dir / page_id
-
-        if not page_backup_dir.exists():
-            return []
+        with self._lock:
+            backup_files = list(self._page_backups(page_id))
+            meta = self._read_meta(page_id) if backup_files else {}
 
         backups = []
-        for backup_file in sorted(page_backup_dir.glob("*.json"), reverse=True):
-            with open(backup_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                backups.append(
-                    {
-                        "timestamp": data["timestamp"],
-                        "title": data["title"],
-                        "version": data["version"],
-                    }
-                )
+        for backup_file in backup_files:
+            data = meta.get(backup_file.stem)
+            if data is None:
+                # Backups written before the metadata log existed
+                data = _load_json(backup_file)
+            backups.append(
+                {
+                    "timestamp": data["timestamp"],
+                    "title": data["title"],
+                    "version": data["version"],
+                }
+            )
 
         return backups
 
-    def _cleanup_old_backups(self, page_id: str) -> None:
-        """Remove old backups exceeding retention limit."""
+    def _page_backups(self, page_id: str) -> list[Path]:
+        """Backup files for a page, newest first (caller holds self._lock)."""
         page_backup_dir = self.backup_dir / page_id
+        try:
+            mtime = page_backup_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._listing_cache.pop(page_id, None)
+            return []
+
+        cached = self._listing_cache.get(page_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
         backups = sorted(page_backup_dir.glob("*.json"), reverse=True)
+        self._listing_cache[page_id] = (mtime, backups)
+        return backups
+
+    def _read_meta(self, page_id: str) -> dict[str, dict]:
+        """Metadata rows by timestamp from a page's log (caller holds self._lock)."""
+        try:
+            raw = (self.backup_dir / page_id / "meta.jsonl").read_bytes()
+        except FileNotFoundError:
+            return {}
+
+        meta = {}
+        for line in raw.splitlines():
+            try:
+                row = _loads_json(line)
+            except ValueError:
+                continue  # a row torn by a crash mid-append
+            meta[row["timestamp"]] = row
+        return meta
+
+    def _append_meta(self, page_id: str, row: dict) -> None:
+        """Append a metadata row, compacting the log (caller holds self._lock)."""
+        meta_file = self.backup_dir / page_id / "meta.jsonl"
+        rows = self._meta_rows.get(page_id)
+        if rows is None:
+            rows = len(self._read_meta(page_id))
+
+        with meta_file.open("ab") as f:
+            f.write(_dumps_compact(row) + b"\n")
+        rows += 1
+
+        # Rows of pruned backups are only dropped once they outnumber the
+        # retained ones, keeping the common path a single append
+        if rows > 2 * max(self.retention_limit, 1):
+            meta = self._read_meta(page_id)
+            kept = [meta[f.stem] for f in self._page_backups(page_id) if f.stem in meta]
+            _write_atomic(meta_file, b"".join(_dumps_compact(r) + b"\n" for r in kept))
+            rows = len(kept)
+        self._meta_rows[page_id] = rows
+
+    def _cleanup_old_backups(self, page_id: str) -> None:
+        """Remove old backups exceeding retention limit (caller holds self._lock)."""
+        backups = self._page_backups(page_id)
+
+        # Delete backups exceeding limit (their metadata rows are compacted
+        # away later by _append_meta)
+        while len(backups) > self.retention_limit:
+            backups.pop().unlink(missing_ok=True)
 
-        # Delete backups exceeding limit
-        for backup_file in backups[self.retention_limit :]:
-            backup_file.unlink()
+
+# Process-wide manager for the default backup directory, shared by every
+# caller that does not bring its own so they also share one listing cache
+DEFAULT_BACKUP_MANAGER = BackupManager()
 
 
 class ADFValidator:
@@ -650,7 +1181,9 @@ class ADFValidator:
     @staticmethod
     def validate_adf(adf: dict) -> list[str]:
         """
-        Validate ADF structure.
+        Validate the ADF document root.
+
+        Per-node checks are done by UnifiedADFWalker while it walks the tree.
 
         Args:
             adf: ADF JSON structure to validate
@@ -676,40 +1209,6 @@ class ADFValidator:
         elif not isinstance(adf.get("content"), list):
             errors.append("ADF 'content' must be a list")
 
-        # Validate text nodes
-        errors.extend(ADFValidator._validate_nodes_recursive(adf))
-
-        return errors
-
-    @staticmethod
-    def _validate_nodes_recursive(node: Any, path: str = "") -> list[str]:
-        """Recursively validate nodes."""
-        errors = []
-
-        if not isinstance(node, dict):
-            return errors
-
-        node_type = node.get("type")
-
-        # Validate text nodes
-        if node_type == "text":
-            if "text" not in node:
-                errors.append(f"Text node at {path} missing 'text' field")
-            elif not isinstance(node.get("text"), str):
-                errors.append(f"Text node at {path} 'text' must be string")
-
-        # Validate macro nodes
-        if node_type in ADFTextExtractor.MACRO_NODE_TYPES:
-            if "attrs" not in node:
-                errors.append(f"Macro node at {path} missing 'attrs' field")
-
-        # Recurse into content
-        content = node.get("content")
-        if isinstance(content, list):
-            for i, child in enumerate(content):
-                child_path = f"{path}.content[{i}]" if path else f"content[{i}]"
-                errors.extend(ADFValidator._validate_nodes_recursive(child, child_path))
-
         return errors
 
 
@@ -722,10 +1221,10 @@ class MCPJsonDiffRoundtrip:
 
         Args:
             mcp_client: MCP client for Confluence operations
-            backup_manager: Backup manager (creates default if None)
+            backup_manager: Backup manager (DEFAULT_BACKUP_MANAGER if None)
         """
         self.mcp_client = mcp_client
-        self.backup_manager = backup_manager or BackupManager()
+        self.backup_manager = backup_manager or DEFAULT_BACKUP_MANAGER
         self.validator = ADFValidator()
 
     def edit_page(
@@ -782,11 +1281,13 @@ class MCPJsonDiffRoundtrip:
                     "details": validation_errors,
                 }
 
-            # Step 2: Detect macros (if advanced mode requested)
+            # Step 2: Walk the page once for text nodes, Markdown, and macros
+            # (macro bodies included up front when advanced mode is requested)
+            walker = UnifiedADFWalker()
+            walked = walker.walk(adf_content, include_macro_bodies=advanced_mode)
             include_macro_bodies = False
             if advanced_mode:
-                detector = MacroBodyDetector()
-                macros = detector.detect_macros_with_content(adf_content)
+                macros = walked.macros
 
                 if macros:
                     print(f"\n🔍 Found {len(macros)} macro(s) with editable content:")
@@ -811,6 +1312,21 @@ class MCPJsonDiffRoundtrip:
                         "✅ No macros with editable content detected. Proceeding normally."
                     )
 
+                if not include_macro_bodies:
+                    walked = walker.walk(adf_content)
+
+            # Validation errors come from the walk matching the chosen mode:
+            # in Safe Mode, macro bodies are neither edited nor validated
+            if walked.errors:
+                print("❌ Invalid ADF format:")
+                for error in walked.errors:
+                    print(f"   - {error}")
+                return {
+                    "status": "error",
+                    "error": "Invalid ADF format",
+                    "details": walked.errors,
+                }
+
             # Step 3: Create backup
             print("💾 Creating backup...")
             try:
@@ -832,13 +1348,9 @@ class MCPJsonDiffRoundtrip:
                     return {"status": "error", "error": "Backup creation failed"}
                 backup_file = None
 
-            # Step 4: Extract text nodes
-            extractor = ADFTextExtractor(skip_macro_bodies=not include_macro_bodies)
-            original_nodes = extractor.extract_text_nodes(adf_content)
-
-            # Step 5: Convert to Markdown
-            converter = SimpleMarkdownConverter()
-            markdown = converter.convert_to_markdown(adf_content, include_macro_bodies)
+            # Step 4-5: Text nodes and Markdown from the walk above
+            original_nodes = walked.text_nodes
+            markdown = walked.markdown
 
             # Step 6: Let Claude edit (simulated for now)
             # TODO: Integrate with Claude API
@@ -857,6 +1369,7 @@ class MCPJsonDiffRoundtrip:
             print(f"🔄 Found {len(changes)} text change(s)")
 
             # Step 8: Apply changes to ADF
+            extractor = ADFTextExtractor(skip_macro_bodies=not include_macro_bodies)
             patched_adf = extractor.apply_text_changes(adf_content, changes)
 
             # Step 9: Write back via MCP
@@ -947,14 +1460,23 @@ class MCPJsonDiffRoundtrip:
             page_id: Confluence page ID
 
         Returns:
-            Page data dict with title, version, body (ADF)
+            Page data dict with title, version, spaceId, body (ADF)
         """
         if hasattr(self.mcp_client, "get_page"):
             # Using mock client (for testing)
             return self.mcp_client.get_page(cloud_id, page_id, content_format="adf")
 
         base_url, auth = get_auth()
-        return get_page_adf(base_url, auth, page_id)
+        page = get_page_adf(base_url, auth, page_id)
+
+        # The ADF arrives as a JSON string inside the page object; decode it
+        # once with the fast codec into the shape edit_page expects
+        return {
+            "title": page.get("title", ""),
+            "version": page.get("version", {}).get("number", 1),
+            "spaceId": page.get("spaceId"),
+            "body": {"adf": _loads_json(page["body"]["atlas_doc_format"]["value"])},
+        }
 
     def _write_page(self, cloud_id: str, page_id: str, adf_content: dict) -> None:
         """
@@ -966,13 +1488,24 @@ class MCPJsonDiffRoundtrip:
             adf_content: Page ADF body to write
         """
         if hasattr(self.mcp_client, "update_page"):
-            # Using mock client (for testing)
-            self.mcp_client.update_page(
-                cloud_id=cloud_id,
-                page_id=page_id,
-                body=json.dumps(adf_content),
-                content_format="adf",
-            )
+            # Using mock client (for testing); clients that opt in with an
+            # explicit True (mock attributes are truthy) get the UTF-8 bytes
+            # as serialized, skipping a decode/encode round trip
+            if getattr(self.mcp_client, "accepts_bytes_body", False) is True:
+                self.mcp_client.update_page(
+                    cloud_id=cloud_id,
+                    page_id=page_id,
+                    body=_dumps_compact(adf_content),
+                    content_format="adf",
+                    content_encoding="utf-8",
+                )
+            else:
+                self.mcp_client.update_page(
+                    cloud_id=cloud_id,
+                    page_id=page_id,
+                    body=_dumps_body(adf_content),
+                    content_format="adf",
+                )
             return
 
         # Read current page to get title and version (required for update)
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 # /// script
 # requires-python = ">=3.14"
-# dependencies = []
+# dependencies = [
+#   "orjson>=3.9.0",
+# ]
 # ///
 """
 Helper functions for Method 6 roundtrip editing in Claude Code environment.
@@ -13,16 +15,74 @@ Usage:
     uv run roundtrip_helper.py  # Will show usage message
 """
 
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 # Import core classes
 from mcp_json_diff_roundtrip import (
     ADFTextExtractor,
-    SimpleMarkdownConverter,
+    ADFWalkResult,
     TextDiffer,
-    BackupManager,
-    MacroBodyDetector,
+    DEFAULT_BACKUP_MANAGER,
     ADFValidator,
+    UnifiedADFWalker,
 )
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback keeps the helper dependency-free
+    orjson = None
+
+# Shared helpers: all are stateless apart from the backup manager's listing
+# cache, which is shared with MCPJsonDiffRoundtrip and rescans a page's backup
+# directory whenever another writer has changed it
+_VALIDATOR = ADFValidator()
+_WALKER = UnifiedADFWalker()
+_DIFFER = TextDiffer()
+_BACKUP_MGR = DEFAULT_BACKUP_MANAGER
+_EXTRACTORS = {skip: ADFTextExtractor(skip_macro_bodies=skip) for skip in (True, False)}
+
+# Walk results for recently seen page versions; Claude typically calls
+# process_confluence_edit several times on the same unchanged page
+_WALK_CACHE_SIZE = 32
+_walk_cache: OrderedDict[tuple[bytes, int, bool], ADFWalkResult] = OrderedDict()
+
+# Walks handed out for editing, per page fingerprint (hex) and mode: an
+# unedited save skips diffing entirely, and an edited one reuses the text
+# nodes instead of walking the ADF again
+_PREPARED_SIZE = 32
+_prepared: OrderedDict[tuple[str, bool], ADFWalkResult] = OrderedDict()
+
+
+def _fingerprint(adf: dict) -> bytes:
+    """Content hash of an ADF document, independent of key order."""
+    if orjson is not None:
+        data = orjson.dumps(adf, option=orjson.OPT_SORT_KEYS)
+    else:
+        data = json.dumps(adf, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _walk_cached(
+    page_adf: dict, fingerprint: bytes, page_version: int, include_macro_bodies: bool
+) -> ADFWalkResult:
+    """Walk a page, reusing the result for an already seen page version."""
+    key = (fingerprint, page_version, include_macro_bodies)
+    walked = _walk_cache.get(key)
+    if walked is not None:
+        _walk_cache.move_to_end(key)
+        return walked
+
+    walked = _WALKER.walk(page_adf, include_macro_bodies=include_macro_bodies)
+    _walk_cache[key] = walked
+    if len(_walk_cache) > _WALK_CACHE_SIZE:
+        _walk_cache.popitem(last=False)
+    return walked
+
 
 def process_confluence_edit(
     page_adf: dict,
@@ -59,58 +119,162 @@ def process_confluence_edit(
         - markdown: Markdown for Claude to edit
         - backup_file: Path to backup
         - macros: List of detected macros (if any)
+        - page_fingerprint: Content hash to pass back to
+          compute_changes_and_patch
+    """
+    result, walked, include_macro_bodies = _analyze_page(
+        page_adf, page_id, page_title, page_version, advanced_mode
+    )
+    if walked is None:
+        return result
+
+    # Step 4: Create backup
+    def backup() -> Path:
+        return _BACKUP_MGR.create_backup(
+            page_id=page_id,
+            adf_content=page_adf,
+            version=page_version,
+            title=page_title,
+            space_id=space_id,
+        )
+
+    return _ready_for_edit(
+        result, walked, include_macro_bodies, backup, edit_instruction
+    )
+
+
+def process_confluence_edits(pages: list[dict], max_workers: int = 4) -> list[dict]:
+    """
+    Process several Confluence page edits as one batch.
+
+    Backups are written on a small thread pool while the next pages are
+    validated and converted, so disk I/O overlaps with the walks.
+
+    Args:
+        pages: One dict per page, holding process_confluence_edit's keyword
+            arguments (page_adf, page_id, page_title, page_version, space_id,
+            edit_instruction, and optionally advanced_mode)
+        max_workers: Backup threads (kept small; backups share one disk)
+
+    Returns:
+        One process_confluence_edit result dict per page, in input order
+    """
+    staged = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for page in pages:
+            result, walked, include_macro_bodies = _analyze_page(
+                page["page_adf"],
+                page["page_id"],
+                page["page_title"],
+                page["page_version"],
+                page.get("advanced_mode", False),
+            )
+            backup = None
+            if walked is not None:
+                backup = executor.submit(
+                    _BACKUP_MGR.create_backup,
+                    page_id=page["page_id"],
+                    adf_content=page["page_adf"],
+                    version=page["page_version"],
+                    title=page["page_title"],
+                    space_id=page["space_id"],
+                ).result
+            staged.append((page, result, walked, include_macro_bodies, backup))
+
+        return [
+            result
+            if walked is None
+            else _ready_for_edit(
+                result,
+                walked,
+                include_macro_bodies,
+                backup,
+                page["edit_instruction"],
+            )
+            for page, result, walked, include_macro_bodies, backup in staged
+        ]
+
+
+def _analyze_page(
+    page_adf: dict,
+    page_id: str,
+    page_title: str,
+    page_version: int,
+    advanced_mode: bool,
+) -> tuple[dict, ADFWalkResult | None, bool]:
+    """
+    Validate a page and walk it in the mode it will be edited in.
+
+    Returns:
+        (result, walked, include_macro_bodies); walked is None when the
+        result already carries a validation error
     """
     result = {"status": "pending", "page_id": page_id, "page_title": page_title}
 
-    # Step 1: Validate ADF
-    validator = ADFValidator()
-    errors = validator.validate_adf(page_adf)
+    # Step 1: Validate ADF root (nodes are checked during the walk)
+    errors = _VALIDATOR.validate_adf(page_adf)
     if errors:
         result["status"] = "error"
         result["error"] = "Invalid ADF format"
         result["validation_errors"] = errors
-        return result
-
-    # Step 2: Detect macros
-    detector = MacroBodyDetector()
-    macros = detector.detect_macros_with_content(page_adf)
+        return result, None, False
+
+    # Step 2: Walk the page once for macros, text nodes, and Markdown
+    # (macro bodies included up front when advanced mode is requested);
+    # repeated calls for the same page version reuse the cached walk
+    fingerprint = _fingerprint(page_adf)
+    result["page_fingerprint"] = fingerprint.hex()
+    walked = _walk_cached(page_adf, fingerprint, page_version, advanced_mode)
+    macros = walked.macros
     result["macros"] = [
         {"type": m.type, "preview": m.preview, "text_count": m.text_count}
         for m in macros
     ]
 
-    # Step 3: Create backup
-    backup_manager = BackupManager()
-    try:
-        backup_file = backup_manager.create_backup(
-            page_id=page_id,
-            adf_content=page_adf,
-            version=page_version,
-            title=page_title,
-            space_id=space_id,
-        )
-        result["backup_file"] = str(backup_file)
-    except Exception as e:
-        result["status"] = "error"
-        result["error"] = f"Backup failed: {e}"
-        return result
-
-    # Step 4: Determine mode
+    # Step 3: Determine mode
     include_macro_bodies = False
     if advanced_mode and macros:
         # User should be prompted before this function is called
         include_macro_bodies = True
+    elif advanced_mode:
+        walked = _walk_cached(page_adf, fingerprint, page_version, False)
+
+    # Validation errors come from the walk matching the chosen mode:
+    # in Safe Mode, macro bodies are neither edited nor validated
+    if walked.errors:
+        result["status"] = "error"
+        result["error"] = "Invalid ADF format"
+        result["validation_errors"] = walked.errors
+        return result, None, False
 
-    # Step 5: Extract text and convert to Markdown
-    extractor = ADFTextExtractor(skip_macro_bodies=not include_macro_bodies)
-    original_nodes = extractor.extract_text_nodes(page_adf)
+    return result, walked, include_macro_bodies
 
-    converter = SimpleMarkdownConverter()
-    markdown = converter.convert_to_markdown(page_adf, include_macro_bodies)
 
-    result["markdown"] = markdown
-    result["original_text_nodes"] = len(original_nodes)
+def _ready_for_edit(
+    result: dict,
+    walked: ADFWalkResult,
+    include_macro_bodies: bool,
+    backup: Callable[[], Path],
+    edit_instruction: str,
+) -> dict:
+    """Record the backup and hand the page's Markdown over for editing."""
+    try:
+        result["backup_file"] = str(backup())
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"Backup failed: {e}"
+        return result
+
+    # Step 5: Markdown for Claude (NODE anchors let compute_changes_and_patch
+    # map edited lines straight back to text nodes)
+    result["markdown"] = walked.markdown
+    result["original_text_nodes"] = len(walked.text_nodes)
     result["mode"] = "advanced" if include_macro_bodies else "safe"
+    key = (result["page_fingerprint"], include_macro_bodies)
+    _prepared[key] = walked
+    _prepared.move_to_end(key)
+    if len(_prepared) > _PREPARED_SIZE:
+        _prepared.popitem(last=False)
 
     # Step 6: Return for Claude to edit
     # Claude will edit the markdown and call compute_changes_and_patch
@@ -125,6 +289,7 @@ def compute_changes_and_patch(
     original_nodes_data: list,  # Can be reconstructed if needed
     edited_markdown: str,
     include_macro_bodies: bool = False,
+    original_fingerprint: str | None = None,
 ) -> dict:
     """
     Compute changes between original and edited markdown, then patch ADF.
@@ -136,6 +301,8 @@ def compute_changes_and_patch(
         original_nodes_data: Original text nodes (from process_confluence_edit)
         edited_markdown: Markdown edited by Claude
         include_macro_bodies: Whether macro bodies were included
+        original_fingerprint: page_fingerprint from process_confluence_edit
+            (hashed from original_adf when omitted)
 
     Returns:
         dict with:
@@ -144,19 +311,24 @@ def compute_changes_and_patch(
         - changes: List of changes
         - change_count: Number of changes
     """
-    # Re-extract text nodes (to ensure consistency)
-    extractor = ADFTextExtractor(skip_macro_bodies=not include_macro_bodies)
-    original_nodes = extractor.extract_text_nodes(original_adf)
+    if original_fingerprint is None:
+        original_fingerprint = _fingerprint(original_adf).hex()
+    extractor = _EXTRACTORS[not include_macro_bodies]
+    walked = _prepared.get((original_fingerprint, include_macro_bodies))
+    if walked is not None:
+        # Markdown returned exactly as rendered: nothing to diff
+        if edited_markdown == walked.markdown:
+            return _no_changes()
+        original_nodes = walked.text_nodes
+    else:
+        # Page not prepared by this process: extract its text nodes
+        original_nodes = extractor.extract_text_nodes(original_adf)
 
     # Compute diff
-    differ = TextDiffer()
-    changes = differ.compute_changes(original_nodes, edited_markdown)
+    changes = _DIFFER.compute_changes(original_nodes, edited_markdown)
 
     if not changes:
-        return {
-            "status": "no_changes",
-            "message": "No changes detected between original and edited content",
-        }
+        return _no_changes()
 
     # Apply changes
     patched_adf = extractor.apply_text_changes(original_adf, changes)
@@ -165,13 +337,25 @@ def compute_changes_and_patch(
         "status": "success",
         "patched_adf": patched_adf,
         "changes": [
-            {"path": c.path, "old_text": c.old_text, "new_text": c.new_text}
+            {
+                "path": ".".join(map(str, c.path)),
+                "old_text": c.old_text,
+                "new_text": c.new_text,
+            }
             for c in changes
         ],
         "change_count": len(changes),
     }
 
 
+def _no_changes() -> dict:
+    """Result for an edit that leaves the page text unchanged."""
+    return {
+        "status": "no_changes",
+        "message": "No changes detected between original and edited content",
+    }
+
+
 def list_backups_for_page(page_id: str) -> list[dict]:
     """
     List available backups for a page.
@@ -182,8 +366,7 @@ def list_backups_for_page(page_id: str) -> list[dict]:
     Returns:
         List of backup info dicts
     """
-    backup_manager = BackupManager()
-    return backup_manager.list_backups(page_id)
+    return _BACKUP_MGR.list_backups(page_id)
 
 
 def load_backup_for_rollback(page_id: str, timestamp: str | None = None) -> dict:
@@ -197,8 +380,7 @@ def load_backup_for_rollback(page_id: str, timestamp: str | None = None) -> dict
     Returns:
         Backup data with adf_content
     """
-    backup_manager = BackupManager()
-    return backup_manager.load_backup(page_id, timestamp)
+    return _BACKUP_MGR.load_backup(page_id, timestamp)
 
 
 if __name__ == "__main__":
@@ -26,8 +26,32 @@ Usage:
 """
 
 import sys
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+# Special characters in CQL, escaped in a single translate pass
+_CQL_TRANS = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+
+# CQL strings are pure functions of the query and interactive re-searches
+# repeat queries, so both helpers are served from small caches
+@lru_cache(maxsize=256)
+def _escape_cql(query: str) -> str:
+    """Escape CQL special characters (one pass, so no double escaping)."""
+    # Most queries need no escaping; two substring scans are far cheaper
+    # than a dict-driven translate that always copies
+    if '"' not in query and "\\" not in query:
+        return query
+    return query.translate(_CQL_TRANS)
+
+
+@lru_cache(maxsize=256)
+def _cql_query(query: str) -> str:
+    """Build the title + text search CQL for a query."""
+    escaped_query = _escape_cql(query)
+    return f'title ~ "{escaped_query}" OR text ~ "{escaped_query}"'
 
 
 @dataclass
@@ -53,6 +77,13 @@ class SmartSearch:
     LOW_CONFIDENCE = 0.4
     SUGGESTION_THRESHOLD = 0.6
 
+    # Base confidence by title match count (3+ matches share the top entry)
+    _MATCH_CONFIDENCE = (0.3, 0.7, 0.8, 0.9)
+
+    # Levels for positive confidence, split at the thresholds above
+    _LEVEL_THRESHOLDS = (MEDIUM_CONFIDENCE, HIGH_CONFIDENCE)
+    _LEVELS = ("low", "medium", "high")
+
     def __init__(self):
         """Initialize smart search analyzer"""
         pass
@@ -79,26 +110,27 @@ class SmartSearch:
         Returns:
             Confidence score (0.0 to 1.0)
         """
-        if not results:
-            return 0.0
+        return self._score(query.lower(), self._lowered_titles(results))[2]
 
-        total_results = len(results)
+    def _score(
+        self, query_lower: str, lowered_titles: List[str]
+    ) -> Tuple[int, int, float]:
+        """
+        Score results in one pass over their lowercased titles.
 
-        # Count title matches (case-insensitive, partial match)
-        query_lower = query.lower()
-        title_matches = sum(
-            1 for result in results if query_lower in result.get("title", "").lower()
-        )
+        Returns:
+            (total_results, title_matches, confidence)
+        """
+        total_results = len(lowered_titles)
+        if not total_results:
+            return 0, 0, 0.0
+
+        # Count title matches (case-insensitive, partial match); a filtering
+        # comprehension beats summing a generator of bools
+        title_matches = len([t for t in lowered_titles if query_lower in t])
 
         # Calculate confidence based on title matches
-        if title_matches >= 3:
-            base_confidence = 0.9
-        elif title_matches == 2:
-            base_confidence = 0.8
-        elif title_matches == 1:
-            base_confidence = 0.7
-        else:
-            base_confidence = 0.3
+        base_confidence = self._MATCH_CONFIDENCE[min(title_matches, 3)]
 
         # Adjust down if too many results (low precision indicator)
         if total_results > 50:
@@ -111,7 +143,7 @@ class SmartSearch:
             match_ratio = title_matches / total_results
             base_confidence = min(1.0, base_confidence * (1 + match_ratio * 0.2))
 
-        return round(base_confidence, 2)
+        return total_results, title_matches, round(base_confidence, 2)
 
     def generate_cql_query(self, query: str) -> str:
         """
@@ -125,13 +157,7 @@ class SmartSearch:
         Returns:
             CQL query string
         """
-        # Escape special CQL characters
-        escaped_query = self._escape_cql(query)
-
-        # Generate title + text search CQL
-        cql = f'title ~ "{escaped_query}" OR text ~ "{escaped_query}"'
-
-        return cql
+        return _cql_query(query)
 
     def _escape_cql(self, query: str) -> str:
         r"""
@@ -145,13 +171,12 @@ class SmartSearch:
         Returns:
             Escaped query string
         """
-        # Escape backslashes first (must be done first)
-        escaped = query.replace("\\", "\\\\")
-
-        # Escape double quotes
-        escaped = escaped.replace('"', '\\"')
+        return _escape_cql(query)
 
-        return escaped
+    @staticmethod
+    def _lowered_titles(results: List[Dict[str, Any]]) -> List[str]:
+        """Lowercase every result title once, for reuse across match counts."""
+        return [result.get("title", "").lower() for result in results]
 
     def analyze_results(
         self, query: str, results: List[Dict[str, Any]]
@@ -166,24 +191,38 @@ class SmartSearch:
         Returns:
             SearchAnalysis with confidence score and suggestions
         """
-        total_results = len(results)
-
-        # Count title matches
-        query_lower = query.lower()
-        title_matches = sum(
-            1 for result in results if query_lower in result.get("title", "").lower()
+        return self._analyze(
+            query, self._score(query.lower(), self._lowered_titles(results))
         )
 
-        # Calculate confidence
-        confidence = self.calculate_confidence(query, results)
+    def analyze_many(
+        self, queries: List[str], results: List[Dict[str, Any]]
+    ) -> List[SearchAnalysis]:
+        """
+        Analyze one result set against several queries.
+
+        Titles are lowercased once and shared by every query.
+
+        Args:
+            queries: Search queries to score
+            results: Search results shared by all queries
+
+        Returns:
+            One SearchAnalysis per query, in input order
+        """
+        lowered_titles = self._lowered_titles(results)
+        return [
+            self._analyze(query, self._score(query.lower(), lowered_titles))
+            for query in queries
+        ]
+
+    def _analyze(self, query: str, score: Tuple[int, int, float]) -> SearchAnalysis:
+        """Build the SearchAnalysis for a query from its _score result."""
+        total_results, title_matches, confidence = score
 
         # Determine confidence level
-        if confidence >= self.HIGH_CONFIDENCE:
-            level = "high"
-        elif confidence >= self.MEDIUM_CONFIDENCE:
-            level = "medium"
-        elif confidence > 0:
-            level = "low"
+        if confidence > 0:
+            level = self._LEVELS[bisect_right(self._LEVEL_THRESHOLDS, confidence)]
         else:
             level = "zero"
 
@@ -6,6 +6,7 @@
 #   "mistune>=3.0.0",
 #   "python-dotenv>=1.0.0",
 #   "PyYAML>=6.0",
+#   "requests>=2.31.0",
 # ]
 # ///
 """
@@ -30,31 +31,57 @@ Environment Variables (in .env file or exported):
     CONFLUENCE_API_TOKEN - API token from https://id.atlassian.com/manage-profile/security/api-tokens
 """
 
+from __future__ import annotations
+
 import sys
 import argparse
+import importlib.util
+import json
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional, List, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple
 
-import yaml
 from dotenv import load_dotenv
-from atlassian import Confluence
 
 # Import router for API selection transparency
 sys.path.insert(0, str(Path(__file__).parent))
 from confluence_router import ConfluenceRouter, OperationType
-from confluence_adf_utils import (
-    get_page_adf,
-    update_page_adf,
-    create_page_adf,
-    _set_page_width,
-)
-from markdown_to_adf import markdown_to_adf
+
+# atlassian, requests, mistune and PyYAML are imported where they are first
+# needed, so --help, --dry-run and cached conversions skip their import cost.
+if TYPE_CHECKING:
+    from atlassian import Confluence
+
+_H1_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+_H1_WINDOW = 4096  # H1 titles are near the top; search this much first
+_FILE_NAME_RE = re.compile(r'"__fileName":\s*"([^"]+)"')
+_IMAGE_RE = re.compile(r"!\[[^\]]*\]\(\s*<?([^)\s>]+)")
+_REMOTE_SRC_RE = re.compile(r"(?:https?|data):", re.IGNORECASE)
+
+# Markdown converted for a --dry-run preview; far more than the preview shows
+_DRY_RUN_PREVIEW_CHARS = 4000
+
+_CACHE_SUFFIX = ".uploadcache.json"
+_CONVERTER_PATH = Path(__file__).parent / "markdown_to_adf.py"
+
+_CONTENT_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+    ".pdf": "application/pdf",
+}
 
 
 def get_confluence_client(env_file: Optional[str] = None) -> Confluence:
     """Get authenticated Confluence client from environment variables."""
+    import requests
+    from atlassian import Confluence
+    from requests.adapters import HTTPAdapter
+
     if env_file:
         load_dotenv(env_file)
     else:
@@ -75,7 +102,16 @@ def get_confluence_client(env_file: Optional[str] = None) -> Confluence:
             missing.append("CONFLUENCE_API_TOKEN")
         raise ValueError(f"Missing environment variables: {', '.join(missing)}")
 
-    return Confluence(url=url, username=username, password=api_token, cloud=True)
+    # One pooled session for every call, sized for the parallel attachment
+    # uploads so workers reuse warm TLS connections instead of reconnecting.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return Confluence(
+        url=url, username=username, password=api_token, cloud=True, session=session
+    )
 
 
 def parse_markdown_file(file_path: Path) -> Tuple[Dict, str, Optional[str]]:
@@ -85,32 +121,50 @@ def parse_markdown_file(file_path: Path) -> Tuple[Dict, str, Optional[str]]:
     Returns:
         Tuple of (frontmatter_dict, markdown_content, extracted_title)
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as yaml_loader  # libyaml-backed
+    except ImportError:
+        from yaml import SafeLoader as yaml_loader
+
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    if b"\r" in raw:
+        # Same newline handling as reading in text mode
+        raw = raw.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
 
     frontmatter = {}
-    markdown_content = content
+    markdown_content = None
     title = None
 
-    # Parse frontmatter (between --- markers)
-    if content.startswith("---\n"):
-        parts = content.split("---\n", 2)
-        if len(parts) >= 3:
+    # Parse frontmatter (between --- markers) on the bytes, so only the body
+    # is decoded and libyaml reads the YAML block directly.
+    if raw.startswith(b"---\n"):
+        end = raw.find(b"\n---\n", 3)
+        if end != -1:
             try:
-                frontmatter = yaml.safe_load(parts[1]) or {}
-                markdown_content = parts[2].strip()
+                frontmatter = yaml.load(raw[4 : end + 1], Loader=yaml_loader) or {}
+                markdown_content = raw[end + 5 :].decode("utf-8").strip()
             except yaml.YAMLError as e:
                 print(
                     f"WARNING: Failed to parse YAML frontmatter: {e}", file=sys.stderr
                 )
 
+    if markdown_content is None:
+        markdown_content = raw.decode("utf-8")
+
     # Extract title from frontmatter
     if "title" in frontmatter:
         title = frontmatter["title"]
 
     # Fallback: extract title from first H1 heading
     if not title:
-        match = re.search(r"^#\s+(.+)$", markdown_content, re.MULTILINE)
+        window = min(len(markdown_content), _H1_WINDOW)
+        match = _H1_RE.search(markdown_content, 0, window)
+        # No H1 in the window, or one cut off at its edge: scan everything
+        if match is None or match.end() == window < len(markdown_content):
+            match = _H1_RE.search(markdown_content)
         if match:
             title = match.group(1).strip()
 
@@ -121,54 +175,163 @@ def parse_markdown_file(file_path: Path) -> Tuple[Dict, str, Optional[str]]:
     return frontmatter, markdown_content, title
 
 
+def _markdown_to_adf(markdown: str) -> dict:
+    """Convert Markdown to ADF, importing the converter on first use."""
+    from markdown_to_adf import markdown_to_adf
+
+    return markdown_to_adf(markdown)
+
+
+def _conversion_cache_key(file_path: Path) -> List:
+    """Identify a file's content and the converter that would process it."""
+    st = file_path.stat()
+    return [
+        st.st_mtime_ns,
+        st.st_size,
+        Path(importlib.util.find_spec("mistune").origin).stat().st_mtime_ns,
+        _CONVERTER_PATH.stat().st_mtime_ns,
+    ]
+
+
+def _load_conversion_cache(file_path: Path, key: List) -> Optional[Dict]:
+    """Return the cached conversion for file_path if it is still current."""
+    cache_path = file_path.with_name(file_path.name + _CACHE_SUFFIX)
+    try:
+        cached = json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cached
+
+
+def _save_conversion_cache(file_path: Path, key: List, entry: Dict) -> None:
+    """Store a conversion next to file_path; failures only cost the cache."""
+    try:
+        data = json.dumps({"key": key, **entry}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return  # e.g. YAML dates in frontmatter are not JSON-serializable
+
+    cache_path = file_path.with_name(file_path.name + _CACHE_SUFFIX)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        tmp_path.write_text(data, encoding="utf-8")
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+
+
+def _local_attachments(attachments: List[str]) -> List[str]:
+    """Deduplicate image sources, dropping http(s) URLs and data: URIs."""
+    return [att for att in dict.fromkeys(attachments) if not _REMOTE_SRC_RE.match(att)]
+
+
+def _locate_attachment(base_dir: Path, attachment: str) -> Optional[str]:
+    """Find an attachment relative to the Markdown file, then the CWD."""
+    for candidate in (base_dir / attachment, Path(attachment)):
+        try:
+            os.stat(candidate)
+        except OSError:
+            continue
+        return str(candidate.absolute())
+    return None
+
+
+def _existing_attachment_names(
+    confluence: Confluence, page_id: str, limit: int = 200
+) -> set:
+    """Collect attachment titles on a page, following pagination."""
+    names = set()
+    start = 0
+    while True:
+        page = confluence.get_attachments_from_content(
+            page_id, start=start, limit=limit
+        )
+        results = page.get("results", [])
+        names.update(att["title"] for att in results)
+        if len(results) < limit:
+            return names
+        start += limit
+
+
+def _upload_attachment(
+    confluence: Confluence,
+    page_id: str,
+    attachment_path: str,
+    filename: str,
+    content_type: str,
+) -> str:
+    """Upload a single attachment file and return its status marker."""
+    try:
+        confluence.attach_file(
+            filename=attachment_path,
+            name=filename,
+            content_type=content_type,
+            page_id=page_id,
+            comment="Uploaded via upload_confluence.py",
+        )
+        return "✅"
+    except Exception as e:
+        return f"❌ Error: {e}"
+
+
 def _upload_attachments(
     confluence: Confluence,
     page_id: str,
     attachments: List[str],
     skip_existing: bool = True,
+    max_workers: int = 6,
 ) -> None:
-    """Upload attachment files to a Confluence page."""
+    """Upload attachment files to a Confluence page.
 
-    for i, attachment_path in enumerate(attachments, 1):
-        filename = os.path.basename(attachment_path)
-        print(f"   {i}. {filename}...", end=" ")
+    Uploads run on up to ``max_workers`` threads sharing the client's HTTP
+    session; pass ``max_workers=1`` to upload one file at a time (Confluence
+    Server/Data Center can reject concurrent attachment writes to one page).
+    """
 
-        if not os.path.exists(attachment_path):
-            print("❌ File not found")
-            continue
+    existing_names = set()
+    if skip_existing:
+        try:
+            existing_names = _existing_attachment_names(confluence, page_id)
+        except Exception as e:
+            print(f"   ⚠️  Could not list existing attachments: {e}")
 
+    # Resolve name, content type and existence once per file (one stat call)
+    pending = []
+    for i, attachment_path in enumerate(attachments, 1):
+        path = Path(attachment_path)
+        filename = path.name
         try:
-            # Check if attachment already exists
-            if skip_existing:
-                existing = confluence.get_attachments_from_content(page_id)
-                if any(att["title"] == filename for att in existing.get("results", [])):
-                    print("(exists, skipping)")
-                    continue
-
-            # Determine content type
-            ext = os.path.splitext(filename)[1].lower()
-            content_types = {
-                ".png": "image/png",
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".gif": "image/gif",
-                ".svg": "image/svg+xml",
-                ".pdf": "application/pdf",
-            }
-            content_type = content_types.get(ext, "application/octet-stream")
-
-            # Upload
-            confluence.attach_file(
-                filename=attachment_path,
-                name=filename,
-                content_type=content_type,
-                page_id=page_id,
-                comment="Uploaded via upload_confluence.py",
+            os.stat(path)
+        except OSError:
+            print(f"   {i}. {filename}... ❌ File not found")
+            continue
+        if filename in existing_names:
+            print(f"   {i}. {filename}... (exists, skipping)")
+            continue
+        content_type = _CONTENT_TYPES.get(
+            path.suffix.lower(), "application/octet-stream"
+        )
+        pending.append((i, attachment_path, filename, content_type))
+
+    if max_workers <= 1 or len(pending) <= 1:
+        for i, attachment_path, filename, content_type in pending:
+            print(f"   {i}. {filename}...", end=" ")
+            print(
+                _upload_attachment(
+                    confluence, page_id, attachment_path, filename, content_type
+                )
             )
-            print("✅")
+        return
 
-        except Exception as e:
-            print(f"❌ Error: {e}")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+        futures = {
+            pool.submit(_upload_attachment, confluence, page_id, *item[1:]): item
+            for item in pending
+        }
+        for future in as_completed(futures):
+            i, _, filename, _ = futures[future]
+            print(f"   {i}. {filename}... {future.result()}")
 
 
 def upload_to_confluence_adf(
@@ -181,11 +344,19 @@ def upload_to_confluence_adf(
     skip_existing_attachments: bool = True,
     confluence: Optional[Confluence] = None,
     full_width: bool = True,
+    sequential_uploads: bool = False,
 ) -> Dict:
     """Upload page content via v2 API using ADF format.
 
     Supports both update (page_id) and create (space_key) modes.
     """
+    from confluence_adf_utils import (
+        get_page_adf,
+        update_page_adf,
+        create_page_adf,
+        _set_page_width,
+    )
+
     base_url = os.getenv("CONFLUENCE_URL", "")
     auth = (os.getenv("CONFLUENCE_USER", ""), os.getenv("CONFLUENCE_API_TOKEN", ""))
 
@@ -266,7 +437,13 @@ def upload_to_confluence_adf(
     # Upload attachments via v1 API (v2 attachment API is the same)
     if attachments and confluence:
         print(f"\n📎 Uploading {len(attachments)} attachments...")
-        _upload_attachments(confluence, page_id, attachments, skip_existing_attachments)
+        _upload_attachments(
+            confluence,
+            page_id,
+            attachments,
+            skip_existing_attachments,
+            max_workers=1 if sequential_uploads else 6,
+        )
 
     return {
         "id": result.get("id", page_id),
@@ -354,6 +531,16 @@ IMPORTANT:
         action="store_true",
         help="Re-upload all attachments even if they exist",
     )
+    parser.add_argument(
+        "--sequential-uploads",
+        action="store_true",
+        help="Upload attachments one at a time (for Confluence Server/Data Center)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and don't write the <file>{_CACHE_SUFFIX} conversion cache",
+    )
     parser.add_argument(
         "--width",
         type=str,
@@ -375,14 +562,27 @@ IMPORTANT:
         print(f"ERROR: File not found: {args.file}", file=sys.stderr)
         sys.exit(1)
 
+    # Reuse the previous conversion when neither the file nor the converter
+    # changed since it was cached
+    cache_key = None if args.no_cache else _conversion_cache_key(file_path)
+    cached = _load_conversion_cache(file_path, cache_key) if cache_key else None
+
     # Parse markdown
-    try:
-        print(f"\n📖 Reading: {args.file}")
-        frontmatter, markdown_content, extracted_title = parse_markdown_file(file_path)
-        print(f"   Length: {len(markdown_content)} characters")
-    except Exception as e:
-        print(f"ERROR: Failed to parse markdown: {e}", file=sys.stderr)
-        sys.exit(1)
+    if cached:
+        print(f"\n📖 Reading: {args.file} (cached)")
+        frontmatter = cached["frontmatter"]
+        extracted_title = cached["title"]
+        print(f"   Length: {cached['length']} characters")
+    else:
+        try:
+            print(f"\n📖 Reading: {args.file}")
+            frontmatter, markdown_content, extracted_title = parse_markdown_file(
+                file_path
+            )
+            print(f"   Length: {len(markdown_content)} characters")
+        except Exception as e:
+            print(f"ERROR: Failed to parse markdown: {e}", file=sys.stderr)
+            sys.exit(1)
 
     # Determine user intent based on CLI arguments
     # Priority:
@@ -424,15 +624,39 @@ IMPORTANT:
 
     # Convert Markdown to ADF
     try:
-        print("\n🔄 Converting to ADF format (v2 API)...")
-        adf_body = markdown_to_adf(markdown_content)
+        if cached:
+            print("\n🔄 Using cached ADF conversion (v2 API)...")
+            adf_body = cached["adf"]
+            attachments = cached["attachments"]
+        elif args.dry_run and len(markdown_content) > _DRY_RUN_PREVIEW_CHARS:
+            # Only the head is previewed; images are listed from the source
+            print("\n🔄 Converting to ADF format (v2 API, truncated preview)...")
+            adf_body = _markdown_to_adf(markdown_content[:_DRY_RUN_PREVIEW_CHARS])
+            attachments = [
+                m.group(1).lstrip("./") for m in _IMAGE_RE.finditer(markdown_content)
+            ]
+        else:
+            print("\n🔄 Converting to ADF format (v2 API)...")
+            adf_body = _markdown_to_adf(markdown_content)
+            # Track image references for attachment upload
+            attachments = _FILE_NAME_RE.findall(json.dumps(adf_body))
+            if cache_key:
+                _save_conversion_cache(
+                    file_path,
+                    cache_key,
+                    {
+                        "frontmatter": frontmatter,
+                        "title": extracted_title,
+                        "length": len(markdown_content),
+                        "adf": adf_body,
+                        "attachments": attachments,
+                    },
+                )
+        # An image embedded several times is uploaded once (order preserved);
+        # remote and inline images are not files to attach
+        attachments = _local_attachments(attachments)
         adf_content = adf_body.get("content", [])
         print(f"   ADF nodes: {len(adf_content)}")
-        # Track image references for attachment upload
-        import json as _json
-
-        adf_str = _json.dumps(adf_body)
-        attachments = re.findall(r'"__fileName":\s*"([^"]+)"', adf_str)
         if attachments:
             print(f"   Images found: {len(attachments)}")
             for att in attachments:
@@ -441,20 +665,29 @@ IMPORTANT:
         print(f"ERROR: ADF conversion failed: {e}", file=sys.stderr)
         sys.exit(1)
 
+    # Locate every attachment before any network call
+    located = [_locate_attachment(file_path.parent, att) for att in attachments]
+    missing = [att for att, path in zip(attachments, located) if path is None]
+
     # Dry-run mode
     if args.dry_run:
-        import json as _json
-
         dry_run_preview(
             title,
-            _json.dumps(adf_body, indent=2)[:2000],
+            json.dumps(adf_body, indent=2)[:2000],
             space_key,
             page_id,
             parent_id,
-            attachments,
+            [path or att for att, path in zip(attachments, located)],
         )
         return
 
+    if missing:
+        print("ERROR: Attachment files not found:", file=sys.stderr)
+        for att in missing:
+            print(f"   - {att}", file=sys.stderr)
+        sys.exit(1)
+    attachments = located
+
     # Get Confluence client (for attachments and space resolution)
     try:
         confluence = get_confluence_client(env_file=args.env_file)
@@ -477,6 +710,7 @@ IMPORTANT:
             skip_existing_attachments=not args.force_reupload,
             confluence=confluence,
             full_width=full_width,
+            sequential_uploads=args.sequential_uploads,
         )
 
         print("=" * 70)
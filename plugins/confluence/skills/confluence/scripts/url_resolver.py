@@ -24,6 +24,12 @@ import re
 import sys
 from typing import Dict, Union
 
+# Group 1: short URL code (/wiki/x/{code})
+# Group 2: page ID from /wiki/spaces/{space}/pages/{id} or /pages/{id}
+_PAGE_URL_RE = re.compile(
+    r"/wiki/x/([A-Za-z0-9_-]+)|/(?:wiki/spaces/[^/]+/)?pages/(\d+)"
+)
+
 
 def decode_tiny_url(tiny_code: str) -> int:
     """
@@ -44,16 +50,17 @@ def decode_tiny_url(tiny_code: str) -> int:
         ValueError: If decoding fails
     """
     try:
-        # Add padding if needed (Base64 requires length divisible by 4)
-        padded = tiny_code + "=="
+        # Add exactly the padding Base64 needs (length divisible by 4)
+        padded = tiny_code + "=" * (-len(tiny_code) % 4)
 
-        # Convert Confluence TinyUI Base64 to standard Base64
+        # Decode Confluence TinyUI Base64 in one pass via altchars
         # Confluence TinyUI swaps the RFC 4648 URL-safe mapping:
         #   - → / (value 63), _ → + (value 62)
-        standard_b64 = padded.replace("_", "+").replace("-", "/")
+        decoded_bytes = base64.b64decode(padded, altchars=b"_-")
 
-        # Decode Base64
-        decoded_bytes = base64.b64decode(standard_b64)
+        # Page IDs are 64-bit at most
+        if len(decoded_bytes) > 8:
+            raise ValueError(f"decoded {len(decoded_bytes)} bytes, expected <= 8")
 
         # Convert bytes to integer (little-endian)
         # Confluence uses little-endian byte order for page IDs
@@ -98,17 +105,23 @@ def resolve_confluence_url(url_or_id: Union[str, int]) -> Dict[str, str]:
     if isinstance(url_or_id, int):
         return {"type": "page_id", "value": str(url_or_id)}
 
+    # Pattern 1: Direct numeric page ID (checked before strip for the common case)
+    if isinstance(url_or_id, str) and url_or_id.isascii() and url_or_id.isdigit():
+        return {"type": "page_id", "value": url_or_id}
+
     url_str = str(url_or_id).strip()
 
-    # Pattern 1: Direct numeric page ID
-    if url_str.isdigit():
+    if url_str.isascii() and url_str.isdigit():
         return {"type": "page_id", "value": url_str}
 
+    match = _PAGE_URL_RE.search(url_str)
+    if match is None:
+        # Unknown format
+        return {"type": "unknown", "value": url_str}
+
     # Pattern 2: Short URL - /wiki/x/{code}
-    short_url_pattern = r"/wiki/x/([A-Za-z0-9_-]+)"
-    match = re.search(short_url_pattern, url_str)
-    if match:
-        tiny_code = match.group(1)
+    tiny_code = match.group(1)
+    if tiny_code:
         try:
             page_id = decode_tiny_url(tiny_code)
             return {"type": "page_id", "value": str(page_id)}
@@ -116,22 +129,9 @@ def resolve_confluence_url(url_or_id: Union[str, int]) -> Dict[str, str]:
             # Decoding failed, return as unknown
             return {"type": "unknown", "value": url_str, "error": str(e)}
 
-    # Pattern 3: Full URL - /wiki/spaces/{space}/pages/{id}/{title}
-    full_url_pattern = r"/wiki/spaces/[^/]+/pages/(\d+)"
-    match = re.search(full_url_pattern, url_str)
-    if match:
-        page_id = match.group(1)
-        return {"type": "page_id", "value": page_id}
-
-    # Pattern 4: Alternative full URL - /pages/{id}/{title}
-    alt_url_pattern = r"/pages/(\d+)"
-    match = re.search(alt_url_pattern, url_str)
-    if match:
-        page_id = match.group(1)
-        return {"type": "page_id", "value": page_id}
-
-    # Unknown format
-    return {"type": "unknown", "value": url_str}
+    # Pattern 3/4: Full URL - /wiki/spaces/{space}/pages/{id}/{title}
+    # or the shorter /pages/{id}/{title}
+    return {"type": "page_id", "value": match.group(2)}
 
 
 def main():
@@ -0,0 +1,25 @@
+"""Tests for confluence_adf_utils.py — REST payload encoding."""
+
+import json
+from unittest.mock import patch
+
+from confluence_adf_utils import update_page_adf
+
+
+class TestUpdatePageAdf:
+    def test_sends_compact_utf8_payload(self, make_adf_doc):
+        adf = make_adf_doc(
+            {"type": "codeBlock", "content": [{"type": "text", "text": "]]> é"}]}
+        )
+
+        with patch("confluence_adf_utils.requests.request") as request:
+            request.return_value.ok = True
+            update_page_adf("https://x/wiki", ("u", "t"), "42", "Page", adf, 3)
+
+        method, url = request.call_args.args
+        data = request.call_args.kwargs["data"]
+        assert (method, url) == ("PUT", "https://x/wiki/api/v2/pages/42")
+        assert b", " not in data and "é".encode() in data
+        payload = json.loads(data)
+        assert json.loads(payload["body"]["value"]) == adf
+        assert payload["version"]["number"] == 4
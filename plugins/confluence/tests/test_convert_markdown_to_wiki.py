@@ -0,0 +1,40 @@
+"""Tests for convert_markdown_to_wiki.py — Markdown → Confluence Wiki Markup."""
+
+from convert_markdown_to_wiki import convert_markdown_to_wiki
+
+
+class TestInline:
+    def test_heading_and_emphasis(self):
+        wiki = convert_markdown_to_wiki("# Title\n\nSome **bold** and *italic*.")
+        assert wiki == "h1. Title\n\nSome *bold* and _italic_."
+
+    def test_codespan_and_links(self):
+        wiki = convert_markdown_to_wiki(
+            "`x` [text](http://a.com) [http://b.com](http://b.com)"
+        )
+        assert wiki == "{{x}} [text|http://a.com] [http://b.com]"
+
+
+class TestLists:
+    def test_bullet_list(self):
+        wiki = convert_markdown_to_wiki("- a\n- b")
+        assert wiki == "* a\n* b"
+
+    def test_ordered_list_uses_hash_marker(self):
+        """mistune 3 stores 'ordered' on the list token, not the items."""
+        wiki = convert_markdown_to_wiki("1. first\n2. second")
+        assert wiki == "# first\n# second"
+
+    def test_nested_lists_stack_markers(self):
+        wiki = convert_markdown_to_wiki("1. a\n   - x\n   - y\n2. b")
+        assert wiki == "# a\n#* x\n#* y\n# b"
+
+
+class TestBlocks:
+    def test_code_block_with_language(self):
+        wiki = convert_markdown_to_wiki("```python\nprint(1)\n```")
+        assert wiki == "{code:language=python}\nprint(1)\n{code}"
+
+    def test_block_quote(self):
+        wiki = convert_markdown_to_wiki("> quoted")
+        assert wiki == "bq. quoted"
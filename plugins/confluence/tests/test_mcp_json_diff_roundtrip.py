@@ -0,0 +1,401 @@
+"""Tests for mcp_json_diff_roundtrip.py — ADF text extraction, diff, and patching."""
+
+import copy
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import roundtrip_helper
+from mcp_json_diff_roundtrip import (
+    ADFTextExtractor,
+    TextNode,
+    BackupManager,
+    DEFAULT_BACKUP_MANAGER,
+    MacroBodyDetector,
+    MCPJsonDiffRoundtrip,
+    SimpleMarkdownConverter,
+    TextChange,
+    TextDiffer,
+    UnifiedADFWalker,
+)
+
+
+def _paragraph(text):
+    return {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+
+
+class TestApplyTextChanges:
+    def test_patches_text_by_path(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Hello"), _paragraph("World"))
+        extractor = ADFTextExtractor()
+        nodes = extractor.extract_text_nodes(adf)
+
+        patched = extractor.apply_text_changes(
+            adf, [TextChange(path=nodes[1].path, old_text="World", new_text="There")]
+        )
+
+        assert [n.text for n in extractor.extract_text_nodes(patched)] == [
+            "Hello",
+            "There",
+        ]
+
+    def test_original_is_not_mutated(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Hello"), _paragraph("World"))
+        snapshot = copy.deepcopy(adf)
+        extractor = ADFTextExtractor()
+        changes = [
+            TextChange(path=n.path, old_text=n.text, new_text=n.text.upper())
+            for n in extractor.extract_text_nodes(adf)
+        ]
+
+        extractor.apply_text_changes(adf, changes)
+
+        assert adf == snapshot
+
+    def test_untouched_subtrees_are_shared(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Hello"), _paragraph("World"))
+        extractor = ADFTextExtractor()
+        node = extractor.extract_text_nodes(adf)[0]
+
+        patched = extractor.apply_text_changes(
+            adf, [TextChange(path=node.path, old_text="Hello", new_text="Hi")]
+        )
+
+        assert patched["content"][0] is not adf["content"][0]
+        assert patched["content"][1] is adf["content"][1]
+
+
+class TestExtractTextFromMarkdown:
+    def test_strips_block_markers_and_inline_formatting(self):
+        markdown = "# Title\n\n- **bold** item\n1. `code` step\n> *quoted*\n<!-- MACRO: info -->"
+        texts = TextDiffer()._extract_text_from_markdown(markdown)
+        assert texts == ["Title", "bold item", "code step", "quoted"]
+
+    @pytest.mark.parametrize(
+        "line, expected",
+        [
+            ("***x***", "x"),
+            ("***x*** and **a *b* c**", "x and a b c"),
+            ("`a *b* c` and *d*", "a *b* c and d"),
+        ],
+    )
+    def test_strips_nested_emphasis(self, line, expected):
+        assert TextDiffer()._extract_text_from_markdown(line) == [expected]
+
+    def test_skips_code_fences(self):
+        texts = TextDiffer()._extract_text_from_markdown("```python\nx = 1\n```")
+        assert texts == ["x = 1"]
+
+
+class TestComputeChanges:
+    def test_matches_edited_line_by_word_overlap(self):
+        nodes = [
+            TextNode(path=("a",), text="The quick brown fox"),
+            TextNode(path=("b",), text="jumps over the lazy dog"),
+        ]
+        edited = "jumps over the sleepy dog\n\nThe quick brown fox"
+
+        changes = TextDiffer().compute_changes(nodes, edited)
+
+        assert [(c.path, c.new_text) for c in changes] == [
+            (("b",), "jumps over the sleepy dog")
+        ]
+
+    def test_anchored_line_maps_directly_to_its_node(self):
+        nodes = [
+            TextNode(path=("a",), text="Same words here"),
+            TextNode(path=("b",), text="Same words here"),
+        ]
+        edited = "Same words here <!-- NODE: 0 -->\nSame words there <!-- NODE: 1 -->"
+
+        changes = TextDiffer().compute_changes(nodes, edited)
+
+        assert [(c.path, c.new_text) for c in changes] == [(("b",), "Same words there")]
+
+    def test_each_edited_line_is_used_once(self):
+        nodes = [
+            TextNode(path=("a",), text="alpha beta"),
+            TextNode(path=("b",), text="alpha beta"),
+        ]
+
+        changes = TextDiffer().compute_changes(nodes, "alpha beta gamma")
+
+        assert [c.path for c in changes] == [("a",)]
+
+
+class TestUnifiedADFWalker:
+    @pytest.mark.parametrize("include_macro_bodies", [False, True])
+    def test_matches_separate_passes(self, real_adf, include_macro_bodies):
+        walked = UnifiedADFWalker().walk(
+            real_adf, include_macro_bodies, node_anchors=False
+        )
+
+        extractor = ADFTextExtractor(skip_macro_bodies=not include_macro_bodies)
+        assert walked.text_nodes == extractor.extract_text_nodes(real_adf)
+        assert walked.markdown == SimpleMarkdownConverter().convert_to_markdown(
+            real_adf, include_macro_bodies
+        )
+        assert walked.macros == MacroBodyDetector().detect_macros_with_content(real_adf)
+
+    @pytest.mark.parametrize(
+        "include_macro_bodies, expected",
+        [
+            (False, "- item <!-- MACRO: info -->\n\n> q <!-- MACRO: info -->\n"),
+            (True, "- iteminside\n\n> qinside\n"),
+        ],
+    )
+    def test_nested_macros_in_lists_and_quotes(
+        self, make_adf_doc, include_macro_bodies, expected
+    ):
+        panel = {
+            "type": "panel",
+            "attrs": {"panelType": "info"},
+            "content": [_paragraph("inside")],
+        }
+        item = {"type": "listItem", "content": [_paragraph("item"), panel]}
+        adf = make_adf_doc(
+            {"type": "bulletList", "content": [item]},
+            {"type": "blockquote", "content": [_paragraph("q"), panel]},
+        )
+
+        walked = UnifiedADFWalker().walk(adf, include_macro_bodies, node_anchors=False)
+
+        extractor = ADFTextExtractor(skip_macro_bodies=not include_macro_bodies)
+        assert walked.markdown == expected
+        assert walked.markdown == SimpleMarkdownConverter().convert_to_markdown(
+            adf, include_macro_bodies
+        )
+        assert walked.text_nodes == extractor.extract_text_nodes(adf)
+        assert walked.macros == MacroBodyDetector().detect_macros_with_content(adf)
+
+    def test_nested_macro_placeholder_is_not_edited_text(self, make_adf_doc):
+        panel = {"type": "panel", "attrs": {"panelType": "info"}, "content": []}
+        item = {"type": "listItem", "content": [_paragraph("item"), panel]}
+        adf = make_adf_doc({"type": "bulletList", "content": [item]})
+
+        walked = UnifiedADFWalker().walk(adf)
+
+        assert walked.markdown.startswith("- item <!-- MACRO: info --> <!-- NODE: 0")
+        assert TextDiffer().compute_changes(walked.text_nodes, walked.markdown) == []
+        assert TextDiffer()._extract_text_from_markdown(
+            "- <!-- MACRO: info -->\n> quoted <!-- MACRO: expand -->"
+        ) == ["quoted"]
+
+    def test_empty_code_block_still_emits_fence(self, make_adf_doc):
+        adf = make_adf_doc({"type": "codeBlock", "attrs": {"language": "sh"}})
+        assert UnifiedADFWalker().walk(adf).markdown == "```sh\n\n```\n"
+
+    def test_reports_invalid_nodes(self, make_adf_doc):
+        adf = make_adf_doc(
+            {"type": "paragraph", "content": [{"type": "text"}]},
+            {"type": "paragraph", "content": [{"type": "text", "text": 5}]},
+            {"type": "expand", "content": [_paragraph("x")]},
+        )
+
+        errors = UnifiedADFWalker().walk(adf).errors
+
+        assert errors == [
+            "Text node at content[0].content[0] missing 'text' field",
+            "Text node at content[1].content[0] 'text' must be string",
+            "Macro node at content[2] missing 'attrs' field",
+        ]
+
+    def test_single_text_lines_carry_node_anchor(self, make_adf_doc):
+        split = {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "bold", "marks": [{"type": "strong"}]},
+                {"type": "text", "text": " rest"},
+            ],
+        }
+        adf = make_adf_doc(_paragraph("One"), split, _paragraph("Two"))
+
+        markdown = UnifiedADFWalker().walk(adf).markdown
+
+        assert markdown.split("\n") == [
+            "One <!-- NODE: 0 -->",
+            "",
+            "bold rest",
+            "",
+            "Two <!-- NODE: 3 -->",
+            "",
+        ]
+
+
+class TestBackupManager:
+    def test_create_list_and_load(self, make_adf_doc, tmp_path):
+        manager = BackupManager(backup_dir=tmp_path)
+        adf = make_adf_doc(_paragraph("Héllo"))
+
+        manager.create_backup("42", adf, version=7, title="Page", space_id="S")
+
+        [info] = manager.list_backups("42")
+        assert info["title"] == "Page"
+        assert info["version"] == 7
+        assert manager.load_backup("42")["adf_content"] == adf
+        assert manager.load_backup("42", info["timestamp"])["version"] == 7
+
+    def test_retention_limit_removes_oldest(self, make_adf_doc, tmp_path):
+        manager = BackupManager(backup_dir=tmp_path, retention_limit=2)
+        for version in range(1, 4):
+            manager.create_backup(
+                "42", make_adf_doc(), version=version, title="Page", space_id="S"
+            )
+
+        assert [b["version"] for b in manager.list_backups("42")] == [3, 2]
+        assert len(list((tmp_path / "42").iterdir())) == 3  # 2 backups + meta log
+
+    def test_metadata_log_is_compacted(self, make_adf_doc, tmp_path):
+        manager = BackupManager(backup_dir=tmp_path, retention_limit=2)
+        for version in range(1, 8):
+            manager.create_backup(
+                "42", make_adf_doc(), version=version, title="Page", space_id="S"
+            )
+
+        rows = (tmp_path / "42" / "meta.jsonl").read_bytes().splitlines()
+        assert len(rows) <= 4
+        fresh = BackupManager(backup_dir=tmp_path, retention_limit=2)
+        assert [b["version"] for b in fresh.list_backups("42")] == [7, 6]
+
+    def test_lists_backups_missing_from_metadata_log(self, make_adf_doc, tmp_path):
+        manager = BackupManager(backup_dir=tmp_path)
+        manager.create_backup("42", make_adf_doc(), version=1, title="P", space_id="S")
+        (tmp_path / "42" / "meta.jsonl").write_bytes(b'{"torn')
+
+        [info] = BackupManager(backup_dir=tmp_path).list_backups("42")
+
+        assert info["version"] == 1
+
+    def test_sees_backups_written_by_another_manager(self, make_adf_doc, tmp_path):
+        first = BackupManager(backup_dir=tmp_path)
+        second = BackupManager(backup_dir=tmp_path)
+        first.create_backup("42", make_adf_doc(), version=1, title="P", space_id="S")
+        assert [b["version"] for b in first.list_backups("42")] == [1]
+
+        second.create_backup("42", make_adf_doc(), version=2, title="P", space_id="S")
+        [newest, _] = second.list_backups("42")
+
+        assert [b["version"] for b in first.list_backups("42")] == [2, 1]
+        assert first.load_backup("42")["version"] == 2
+        assert first.load_backup("42", newest["timestamp"])["version"] == 2
+
+    def test_controller_defaults_to_shared_manager(self):
+        roundtrip = MCPJsonDiffRoundtrip(MagicMock())
+
+        assert roundtrip.backup_manager is DEFAULT_BACKUP_MANAGER
+        assert roundtrip_helper.DEFAULT_BACKUP_MANAGER is DEFAULT_BACKUP_MANAGER
+
+    def test_load_missing_backup_raises(self, make_adf_doc, tmp_path):
+        manager = BackupManager(backup_dir=tmp_path)
+        with pytest.raises(FileNotFoundError):
+            manager.load_backup("42")
+
+        manager.create_backup("42", make_adf_doc(), version=1, title="P", space_id="S")
+
+        with pytest.raises(FileNotFoundError):
+            manager.load_backup("42", "19700101_000000")
+
+
+class TestEditPage:
+    def test_advanced_mode_safe_choice_reports_no_changes(self, make_adf_doc, tmp_path):
+        panel = {
+            "type": "panel",
+            "attrs": {"panelType": "info"},
+            "content": [_paragraph("Inside the panel")],
+        }
+        client = MagicMock()
+        client.get_page.return_value = {
+            "body": {"adf": make_adf_doc(_paragraph("Hello world"), panel)},
+            "version": 3,
+            "title": "Page",
+            "spaceId": "1",
+        }
+        roundtrip = MCPJsonDiffRoundtrip(client, BackupManager(backup_dir=tmp_path))
+
+        with patch("builtins.input", return_value="1"):
+            result = roundtrip.edit_page("cloud", "123", "noop", advanced_mode=True)
+
+        assert result["status"] == "no_changes"
+        client.update_page.assert_not_called()
+
+    def test_safe_mode_ignores_invalid_macro_body(self, make_adf_doc, tmp_path):
+        panel = {
+            "type": "panel",
+            "attrs": {"panelType": "info"},
+            "content": [_paragraph("Inside"), {"type": "text", "text": 1}],
+        }
+        client = MagicMock()
+        client.get_page.return_value = {
+            "body": {"adf": make_adf_doc(_paragraph("Hello world"), panel)},
+            "version": 3,
+            "title": "Page",
+            "spaceId": "1",
+        }
+        roundtrip = MCPJsonDiffRoundtrip(client, BackupManager(backup_dir=tmp_path))
+
+        with patch("builtins.input", return_value="1"):
+            safe = roundtrip.edit_page("cloud", "123", "noop", advanced_mode=True)
+        with patch("builtins.input", return_value="2"):
+            advanced = roundtrip.edit_page("cloud", "123", "noop", advanced_mode=True)
+
+        assert safe["status"] == "no_changes"
+        assert advanced["status"] == "error"
+
+
+class TestRollbackPage:
+    def test_writes_backup_as_compact_json(self, make_adf_doc, tmp_path):
+        adf = make_adf_doc(_paragraph("Héllo"))
+        manager = BackupManager(backup_dir=tmp_path)
+        manager.create_backup("42", adf, version=1, title="Page", space_id="S")
+        [backup] = manager.list_backups("42")
+        client = MagicMock()
+
+        result = MCPJsonDiffRoundtrip(client, manager).rollback_page(
+            "cloud", "42", backup["timestamp"]
+        )
+
+        assert result["status"] == "success"
+        body = client.update_page.call_args.kwargs["body"]
+        assert json.loads(body) == adf
+        assert "Héllo" in body and ", " not in body
+
+    def test_bytes_capable_client_gets_utf8_bytes(self, make_adf_doc, tmp_path):
+        adf = make_adf_doc(_paragraph("Héllo"))
+        manager = BackupManager(backup_dir=tmp_path)
+        manager.create_backup("42", adf, version=1, title="Page", space_id="S")
+        [backup] = manager.list_backups("42")
+        client = MagicMock(accepts_bytes_body=True)
+
+        MCPJsonDiffRoundtrip(client, manager).rollback_page(
+            "cloud", "42", backup["timestamp"]
+        )
+
+        kwargs = client.update_page.call_args.kwargs
+        assert kwargs["content_encoding"] == "utf-8"
+        assert json.loads(kwargs["body"].decode("utf-8")) == adf
+
+
+class TestReadPage:
+    def test_decodes_rest_page_into_edit_shape(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Héllo"))
+        page = {
+            "title": "Page",
+            "spaceId": "S",
+            "version": {"number": 4},
+            "body": {"atlas_doc_format": {"value": json.dumps(adf)}},
+        }
+        roundtrip = MCPJsonDiffRoundtrip(object(), BackupManager())
+
+        with (
+            patch("mcp_json_diff_roundtrip.get_auth", return_value=("url", ("u", "t"))),
+            patch("mcp_json_diff_roundtrip.get_page_adf", return_value=page),
+        ):
+            page_data = roundtrip._read_page("cloud", "42")
+
+        assert page_data == {
+            "title": "Page",
+            "version": 4,
+            "spaceId": "S",
+            "body": {"adf": adf},
+        }
@@ -93,6 +93,10 @@ class TestUrlResolution:
         assert result["type"] == "page_id"
         assert result["value"] == "987654"
 
+    def test_short_pages_url_and_padded_id_resolve(self):
+        assert resolve_confluence_url("https://x/pages/55/T")["value"] == "55"
+        assert resolve_confluence_url(" 123 \n")["value"] == "123"
+
     def test_unknown_url_returns_unknown_type(self):
         result = resolve_confluence_url("https://example.com/not-confluence")
         assert result["type"] == "unknown"
@@ -107,6 +111,10 @@ class TestUrlResolution:
         """- in TinyUI maps to / (value 63), not + (value 62) as in RFC 4648."""
         assert decode_tiny_url("-4GCcQ") == 1904378367
 
+    def test_tiny_url_longer_than_64_bits_is_rejected(self):
+        with pytest.raises(ValueError):
+            decode_tiny_url("AAAAAAAAAAAAAAAA")
+
     def test_short_url_with_underscore_resolves_correctly(self):
         url = "https://trendmicro.atlassian.net/wiki/x/Ew7_jQ"
         result = resolve_confluence_url(url)
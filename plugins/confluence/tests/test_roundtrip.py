@@ -130,6 +130,19 @@ class TestRoundtripExpand:
         assert para["type"] == "paragraph"
         assert para["content"][0]["text"] == "Hidden"
 
+    def test_nested_and_unclosed_markers(self):
+        markdown = (
+            '<!-- EXPAND: "Outer" -->\n\nA\n\n<!-- EXPAND: "Inner" -->\n\nB\n\n'
+            "<!-- /EXPAND -->\n\n<!-- /EXPAND -->\n\n"
+            '<!-- EXPAND: "Open" -->\n\nC\n'
+        )
+
+        content = markdown_to_adf(markdown)["content"]
+
+        assert [n["type"] for n in content] == ["expand", "paragraph"]
+        assert content[0]["content"][1]["attrs"]["title"] == "Inner"
+        assert content[1]["content"][0]["text"] == "C"
+
 
 class TestRoundtripPanel:
     @pytest.mark.parametrize("panel_type", ["info", "note", "warning", "success"])
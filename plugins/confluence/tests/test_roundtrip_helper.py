@@ -0,0 +1,143 @@
+"""Tests for roundtrip_helper.py — Method 6 helpers used from conversation."""
+
+from unittest.mock import patch
+
+import pytest
+
+import roundtrip_helper
+from mcp_json_diff_roundtrip import BackupManager
+from roundtrip_helper import (
+    compute_changes_and_patch,
+    process_confluence_edit,
+    process_confluence_edits,
+)
+
+
+def _paragraph(text):
+    return {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+
+
+@pytest.fixture(autouse=True)
+def isolated_helper(tmp_path):
+    """Back up into tmp_path and start every test with an empty walk cache."""
+    roundtrip_helper._walk_cache.clear()
+    roundtrip_helper._prepared.clear()
+    with patch.object(
+        roundtrip_helper, "_BACKUP_MGR", BackupManager(backup_dir=tmp_path)
+    ):
+        yield
+    roundtrip_helper._walk_cache.clear()
+    roundtrip_helper._prepared.clear()
+
+
+def _process(adf, version=1, advanced_mode=False):
+    return process_confluence_edit(
+        adf, "42", "Page", version, "S", "edit", advanced_mode=advanced_mode
+    )
+
+
+class TestProcessConfluenceEdit:
+    def test_returns_markdown_for_editing(self, make_adf_doc):
+        result = _process(make_adf_doc(_paragraph("Hello")))
+
+        assert result["status"] == "ready_for_edit"
+        assert result["markdown"] == "Hello <!-- NODE: 0 -->\n"
+        assert result["original_text_nodes"] == 1
+
+    def test_reuses_walk_for_same_page_version(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Hello"))
+
+        with patch.object(
+            roundtrip_helper._WALKER, "walk", wraps=roundtrip_helper._WALKER.walk
+        ) as walk:
+            _process(adf)
+            _process(make_adf_doc(_paragraph("Hello")))
+            _process(adf, version=2)
+
+        assert walk.call_count == 2
+
+    def test_changed_content_is_walked_again(self, make_adf_doc):
+        _process(make_adf_doc(_paragraph("Hello")))
+
+        result = _process(make_adf_doc(_paragraph("Bye")))
+
+        assert result["markdown"] == "Bye <!-- NODE: 0 -->\n"
+
+
+class TestProcessConfluenceEdits:
+    def test_matches_single_page_processing_in_order(self, make_adf_doc):
+        pages = [
+            {
+                "page_adf": make_adf_doc(_paragraph(text)),
+                "page_id": page_id,
+                "page_title": "Page",
+                "page_version": 1,
+                "space_id": "S",
+                "edit_instruction": "edit",
+            }
+            for page_id, text in (("1", "One"), ("2", "Two"), ("3", "Three"))
+        ]
+        pages.append({**pages[0], "page_id": "4", "page_adf": {"type": "doc"}})
+
+        results = process_confluence_edits(pages)
+
+        assert [r["page_id"] for r in results] == ["1", "2", "3", "4"]
+        assert [r["status"] for r in results] == ["ready_for_edit"] * 3 + ["error"]
+        assert results[1]["markdown"] == "Two <!-- NODE: 0 -->\n"
+        assert len(roundtrip_helper._BACKUP_MGR.list_backups("2")) == 1
+        assert results[0].keys() == _process(pages[0]["page_adf"]).keys()
+
+
+class TestComputeChangesAndPatch:
+    def test_unedited_markdown_skips_the_diff(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Hello"))
+        markdown = _process(adf)["markdown"]
+
+        with patch.object(roundtrip_helper._DIFFER, "compute_changes") as diff:
+            result = compute_changes_and_patch(adf, [], markdown)
+
+        assert result["status"] == "no_changes"
+        diff.assert_not_called()
+
+    def test_fingerprint_is_reused_instead_of_rehashing(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Hello"))
+        processed = _process(adf)
+
+        with patch.object(roundtrip_helper, "_fingerprint") as fingerprint:
+            result = compute_changes_and_patch(
+                adf,
+                [],
+                processed["markdown"],
+                original_fingerprint=processed["page_fingerprint"],
+            )
+
+        assert result["status"] == "no_changes"
+        fingerprint.assert_not_called()
+
+    def test_edited_markdown_is_patched(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Hello world"))
+        markdown = _process(adf)["markdown"]
+
+        result = compute_changes_and_patch(
+            adf, [], markdown.replace("Hello world", "Hello there world")
+        )
+
+        assert result["status"] == "success"
+        assert result["patched_adf"]["content"][0]["content"][0]["text"] == (
+            "Hello there world"
+        )
+
+    def test_prepared_text_nodes_are_reused(self, make_adf_doc):
+        adf = make_adf_doc(_paragraph("Hello world"))
+        markdown = _process(adf)["markdown"].replace("world", "there world")
+        extractor = roundtrip_helper._EXTRACTORS[True]
+
+        with patch.object(
+            extractor, "extract_text_nodes", wraps=extractor.extract_text_nodes
+        ) as extract:
+            prepared = compute_changes_and_patch(adf, [], markdown)
+            roundtrip_helper._prepared.clear()
+            unprepared = compute_changes_and_patch(adf, [], markdown)
+
+        assert prepared == unprepared
+        assert extract.call_count == 1
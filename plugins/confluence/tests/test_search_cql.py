@@ -234,6 +234,33 @@ class TestRovoSuggestion:
         # confidence should be formatted as a percentage in the suggestion
         assert "%" in analysis.suggestion
 
+    def test_cql_query_escapes_quotes_and_backslashes(self):
+        """Backslashes are escaped once, before quotes gain their own."""
+        cql = self.searcher.generate_cql_query('a\\"b')
+        assert cql == 'title ~ "a\\\\\\"b" OR text ~ "a\\\\\\"b"'
+
+    @pytest.mark.parametrize(
+        "matches, total, level",
+        [(0, 0, "zero"), (0, 60, "low"), (1, 20, "medium"), (3, 5, "high")],
+    )
+    def test_confidence_level_boundaries(self, matches, total, level):
+        """Levels follow the confidence thresholds for each match count."""
+        results = [{"title": "needle"}] * matches + [{"title": "x"}] * (total - matches)
+        analysis = self.searcher.analyze_results("needle", results)
+        assert analysis.confidence_level == level
+
+    def test_analyze_many_matches_per_query_analysis(self):
+        """Batch analysis over shared results equals analyzing each query."""
+        results = [
+            {"title": "Needle Guide", "id": "1"},
+            {"title": "needle reference", "id": "2"},
+            {"title": "Haystack", "id": "3"},
+        ]
+        queries = ["needle", "HAYSTACK", "missing"]
+        assert self.searcher.analyze_many(queries, results) == [
+            self.searcher.analyze_results(q, results) for q in queries
+        ]
+
 
 # ---------------------------------------------------------------------------
 # main() — Rovo suggestion appears in stdout when confidence is low
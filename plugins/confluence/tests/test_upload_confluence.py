@@ -0,0 +1,200 @@
+"""Tests for upload_confluence.py — Markdown parsing and attachment upload."""
+
+import datetime
+import json
+from unittest.mock import MagicMock, patch
+
+from markdown_to_adf import markdown_to_adf
+from upload_confluence import (
+    _FILE_NAME_RE,
+    _IMAGE_RE,
+    _conversion_cache_key,
+    _load_conversion_cache,
+    _local_attachments,
+    _locate_attachment,
+    _save_conversion_cache,
+    _upload_attachments,
+    get_confluence_client,
+    parse_markdown_file,
+)
+
+
+class TestParseMarkdownFile:
+    def test_frontmatter_title_and_body(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text(
+            "---\ntitle: From Frontmatter\nconfluence:\n  id: 42\n---\n\n# Heading\n\nBody\n",
+            encoding="utf-8",
+        )
+
+        frontmatter, content, title = parse_markdown_file(path)
+
+        assert frontmatter == {"title": "From Frontmatter", "confluence": {"id": 42}}
+        assert content == "# Heading\n\nBody"
+        assert title == "From Frontmatter"
+
+    def test_title_falls_back_to_h1_then_filename(self, tmp_path):
+        with_h1 = tmp_path / "with_h1.md"
+        with_h1.write_text("Intro\n\n# Real Title\n", encoding="utf-8")
+        plain = tmp_path / "plain_name.md"
+        plain.write_text("No heading here\n", encoding="utf-8")
+
+        assert parse_markdown_file(with_h1)[2] == "Real Title"
+        assert parse_markdown_file(plain)[2] == "plain name"
+
+    def test_h1_beyond_or_across_search_window(self, tmp_path):
+        late = tmp_path / "late.md"
+        late.write_text("x\n" * 3000 + "# Late Title\n", encoding="utf-8")
+        straddling = tmp_path / "straddling.md"
+        straddling.write_text("x" * 4090 + "\n# Whole Title\n", encoding="utf-8")
+
+        assert parse_markdown_file(late)[2] == "Late Title"
+        assert parse_markdown_file(straddling)[2] == "Whole Title"
+
+    def test_invalid_frontmatter_keeps_whole_file(self, tmp_path, capsys):
+        path = tmp_path / "doc.md"
+        path.write_text("---\ntitle: [unclosed\n---\nBody\n", encoding="utf-8")
+
+        frontmatter, content, _ = parse_markdown_file(path)
+
+        assert frontmatter == {}
+        assert content.startswith("---\n")
+        assert "WARNING" in capsys.readouterr().err
+
+    def test_crlf_file_with_utf8_frontmatter(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_bytes("---\r\ntitle: Café\r\n---\r\nBody é\r\n".encode())
+
+        frontmatter, content, title = parse_markdown_file(path)
+
+        assert frontmatter == {"title": "Café"}
+        assert content == "Body é"
+
+    def test_unterminated_frontmatter_is_body(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("---\ntitle: Nope\n# Heading\n", encoding="utf-8")
+
+        frontmatter, content, title = parse_markdown_file(path)
+
+        assert frontmatter == {}
+        assert content == "---\ntitle: Nope\n# Heading\n"
+        assert title == "Heading"
+
+
+class TestUploadAttachments:
+    def test_lists_existing_attachments_once(self, tmp_path):
+        paths = []
+        for name in ("a.png", "b.png", "c.png"):
+            path = tmp_path / name
+            path.write_bytes(b"png")
+            paths.append(str(path))
+        confluence = MagicMock()
+        confluence.get_attachments_from_content.side_effect = [
+            {"results": [{"title": f"old{i}.png"} for i in range(200)]},
+            {"results": [{"title": "b.png"}]},
+        ]
+
+        _upload_attachments(confluence, "42", paths)
+
+        assert confluence.get_attachments_from_content.call_count == 2
+        assert confluence.get_attachments_from_content.call_args.kwargs == {
+            "start": 200,
+            "limit": 200,
+        }
+        uploaded = [c.kwargs["name"] for c in confluence.attach_file.call_args_list]
+        assert sorted(uploaded) == ["a.png", "c.png"]
+
+    def test_sequential_uploads_keep_input_order(self, tmp_path, capsys):
+        paths = []
+        for name in ("a.png", "b.jpg", "missing.png"):
+            path = tmp_path / name
+            if name != "missing.png":
+                path.write_bytes(b"img")
+            paths.append(str(path))
+        confluence = MagicMock()
+        confluence.attach_file.side_effect = [None, RuntimeError("boom")]
+
+        _upload_attachments(confluence, "42", paths, skip_existing=False, max_workers=1)
+
+        confluence.get_attachments_from_content.assert_not_called()
+        assert [
+            (c.kwargs["name"], c.kwargs["content_type"])
+            for c in confluence.attach_file.call_args_list
+        ] == [("a.png", "image/png"), ("b.jpg", "image/jpeg")]
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == [
+            "   3. missing.png... ❌ File not found",
+            "   1. a.png... ✅",
+            "   2. b.jpg... ❌ Error: boom",
+        ]
+
+
+class TestGetConfluenceClient:
+    def test_session_pool_fits_parallel_uploads(self, monkeypatch):
+        monkeypatch.setenv("CONFLUENCE_URL", "https://x.atlassian.net/wiki")
+        monkeypatch.setenv("CONFLUENCE_USER", "u")
+        monkeypatch.setenv("CONFLUENCE_API_TOKEN", "t")
+
+        with patch("upload_confluence.load_dotenv"):
+            confluence = get_confluence_client()
+
+        adapter = confluence._session.get_adapter("https://x.atlassian.net/wiki")
+        assert adapter._pool_maxsize >= 6
+
+
+class TestConversionCache:
+    def test_round_trip_until_file_changes(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("# Title\n", encoding="utf-8")
+        key = _conversion_cache_key(path)
+        entry = {"frontmatter": {}, "title": "Title", "adf": {"type": "doc"}}
+
+        _save_conversion_cache(path, key, entry)
+
+        assert _load_conversion_cache(path, key)["adf"] == {"type": "doc"}
+        path.write_text("# Changed title\n", encoding="utf-8")
+        assert _load_conversion_cache(path, _conversion_cache_key(path)) is None
+
+    def test_unserializable_frontmatter_is_not_cached(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("body\n", encoding="utf-8")
+        key = _conversion_cache_key(path)
+
+        _save_conversion_cache(path, key, {"frontmatter": {"d": datetime.date.today()}})
+
+        assert _load_conversion_cache(path, key) is None
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.md"]
+
+
+class TestImageReferences:
+    def test_source_scan_matches_converted_attachments(self):
+        markdown = '![a](./one.png)\n\ntext ![b](two.png "Title") and ![c](<three.svg>)'
+
+        from_source = [m.group(1).lstrip("./") for m in _IMAGE_RE.finditer(markdown)]
+
+        assert from_source == _FILE_NAME_RE.findall(
+            json.dumps(markdown_to_adf(markdown))
+        )
+
+
+class TestLocateAttachment:
+    def test_prefers_markdown_directory_then_cwd(self, tmp_path, monkeypatch):
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "a.png").write_bytes(b"png")
+        (tmp_path / "b.png").write_bytes(b"png")
+        monkeypatch.chdir(tmp_path)
+
+        assert _locate_attachment(docs, "a.png") == str(docs / "a.png")
+        assert _locate_attachment(docs, "b.png") == str(tmp_path / "b.png")
+        assert _locate_attachment(docs, "c.png") is None
+
+    def test_remote_images_are_not_attachments(self):
+        markdown = (
+            "![a](./one.png)\n\n![r](https://example.com/r.png)\n\n"
+            "![d](data:image/png;base64,AAAA)\n\n![again](one.png)"
+        )
+
+        found = _FILE_NAME_RE.findall(json.dumps(markdown_to_adf(markdown)))
+
+        assert _local_attachments(found) == ["one.png"]
@@ -12,22 +12,43 @@ IMPORTANT: This script MUST be run with uv:
 DO NOT run with plain python (dependencies will not be found)
 
 Usage:
-    uv run generate_images.py --config <config_file>
+    uv run generate_images.py --config <config_file> [--force]
+
+    Slides whose output file already exists from an identical slide config
+    are reused; pass --force to regenerate every slide.
 
 Config format:
     {
         "slides": [
             {"number": 1, "prompt": "...", "style": "professional", "temperature": 0.8, "seed": 42},
-            {"number": 2, "prompt": "...", "style": "data-viz"},
+            {"number": 2, "prompt": "...", "style": "data-viz", "lossless": true},
             {"number": 3, "prompt": "Add a border", "reference_image": "./source.png"}
         ],
         "output_dir": "./output/",
         "format": "webp",
         "quality": 90,
         "temperature": 1.0,
-        "seed": 12345
+        "seed": 12345,
+        "concurrency": 4,
+        "rate_limit_rpm": 500,
+        "webp_method": 2
     }
 
+WebP quality:
+    - Saved lossy; presentation styles (professional, data-viz, infographic,
+      trendlife) use at least quality 92 so text and edges stay crisp
+    - Per-slide "lossless": true keeps an exact lossless WebP (much larger)
+
+WebP method:
+    - libwebp speed/size trade-off, 0 (fastest) to 6 (smallest)
+    - Default: 2 (about twice as fast as Pillow's 4, ~5% larger lossy files)
+
+Concurrency:
+    - Number of slides generated in parallel (API calls and image encoding)
+    - Default: 4; use 1 for strictly sequential generation
+    - rate_limit_rpm caps API requests per minute across all workers,
+      retries included (default: 500)
+
 Temperature:
     - Range: 0.0 to 2.0
     - Default: 1.0
@@ -65,12 +86,18 @@ Output files (in system temp directory):
 """
 
 import base64
+import hashlib
 import json
 import sys
 import os
 import io
+import random
+import secrets
+import shutil
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 try:
@@ -79,11 +106,14 @@ except ImportError:
     from datetime import datetime, timezone
 
     UTC = timezone.utc
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
+import openai
 from openai import OpenAI
 from PIL import Image as PILImage
 
+from logo_overlay import composite_logo, detect_layout_type
+
 # Configure UTF-8 encoding for Windows console
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
@@ -94,8 +124,61 @@ TEMP_DIR = Path(tempfile.gettempdir())
 PROGRESS_FILE = TEMP_DIR / "nano-banana-progress.json"
 RESULTS_FILE = TEMP_DIR / "nano-banana-results.json"
 
+# Finished slides with an explicit seed, keyed by fingerprint, for reuse
+# across decks and output directories
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "nano-banana"
+)
+# Least recently used entries beyond this are pruned after each batch
+CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# Minimum seconds between progress file rewrites (final update always lands)
+PROGRESS_MIN_INTERVAL = 0.2
+_last_progress_at = 0.0
+
 GPT_IMAGE_2 = "gpt-image-2"
 
+LOGO_PATH = Path(__file__).parent.parent / "assets/logos/trendlife-2026-logo-light.png"
+
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE_LIMIT_RPM = 500
+DEFAULT_WEBP_METHOD = 2
+
+# Transient API failures (429, 5xx, timeouts, dropped connections) are retried
+# with capped exponential backoff; anything else (auth, bad request) fails fast.
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 60.0
+TRANSIENT_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,
+)
+
+
+# Prompt templates per slide style; "{p}" is replaced by the slide prompt
+_STYLE_TEMPLATES: Dict[str, str] = {
+    "professional": "Professional presentation slide: {p}. Clean, minimal design with clear typography.",
+    "data-viz": "Data visualization slide: {p}. Clear charts and graphs, professional color scheme.",
+    "infographic": "Infographic style: {p}. Visual storytelling with icons and illustrations.",
+    "trendlife": "{p}\n\nUse TrendLife brand colors for Trend Micro presentations:\n- IMPORTANT: Title text and all headings MUST be in Trend Red (#D71920)\n- Primary accents and highlights: Trend Red (#D71920)\n- Guardian Red (#6F0000) for supporting elements and depth\n- Neutral palette: Dark gray (#57585B), medium gray (#808285), light gray (#E7E6E6)\n- Black (#000000) for body text, white (#FFFFFF) for backgrounds\nKeep the design clean, professional, and suitable for corporate presentations.\nDO NOT include any logos or brand text - these will be added separately.",
+}
+_TRENDLIFE_FEATURED_TEMPLATE = "{p}\n\nThis is a title/cover slide for TrendLife (Trend Micro presentations).\nCreate a professional cover design that incorporates the TrendLife logo provided as reference image.\nUse TrendLife brand colors:\n- Trend Red (#D71920) for title and accents\n- Supporting colors: Guardian Red (#6F0000), Dark gray (#57585B), Medium gray (#808285), Light gray (#E7E6E6)\n- Black (#000000) for text, white (#FFFFFF) for backgrounds\nIMPORTANT: Use the exact logo from the reference image - DO NOT modify, redraw, or stylize the logo.\nPosition it prominently (typically center or upper area).\nKeep the design clean and professional."
+
+# Presentation styles are saved as lossy WebP with a raised quality floor
+_PRESENTATION_STYLES = frozenset(_STYLE_TEMPLATES)
+PRESENTATION_MIN_QUALITY = 92
+
+
+def _apply_style(prompt: str, style: Optional[str], featured: bool = False) -> str:
+    """Wrap a slide prompt in its style template (unknown styles pass through)."""
+    if style == "trendlife" and featured:
+        template = _TRENDLIFE_FEATURED_TEMPLATE
+    else:
+        template = _STYLE_TEMPLATES.get(style, "{p}")
+    return template.format(p=prompt)
+
 
 def validate_output_dir(path_str: str) -> Path:
     path = Path(path_str)
@@ -134,6 +217,15 @@ def load_config(config_path: str) -> Dict:
 
     validate_output_dir(config["output_dir"])
 
+    output_format = config.get("format", "webp")
+    if not isinstance(output_format, str) or output_format.lower() not in _SAVERS:
+        print(
+            f"Error: Unsupported format: {output_format} "
+            f"(expected one of: {', '.join(_SAVERS)})",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
     if "temperature" in config:
         temp = config["temperature"]
         if not isinstance(temp, (int, float)) or temp < 0.0 or temp > 2.0:
@@ -151,6 +243,41 @@ def load_config(config_path: str) -> Dict:
             )
             sys.exit(1)
 
+    if "concurrency" in config:
+        concurrency = config["concurrency"]
+        if (
+            not isinstance(concurrency, int)
+            or isinstance(concurrency, bool)
+            or concurrency < 1
+        ):
+            print(
+                f"Error: concurrency must be a positive integer, got: {concurrency}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    if "rate_limit_rpm" in config:
+        rpm = config["rate_limit_rpm"]
+        if not isinstance(rpm, (int, float)) or isinstance(rpm, bool) or rpm <= 0:
+            print(
+                f"Error: rate_limit_rpm must be a positive number, got: {rpm}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    if "webp_method" in config:
+        method = config["webp_method"]
+        if (
+            not isinstance(method, int)
+            or isinstance(method, bool)
+            or not 0 <= method <= 6
+        ):
+            print(
+                f"Error: webp_method must be an integer 0-6, got: {method}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
     for i, slide in enumerate(config["slides"]):
         if "number" not in slide:
             print(f"Error: Slide {i} missing 'number' field", file=sys.stderr)
@@ -177,6 +304,14 @@ def load_config(config_path: str) -> Dict:
                 )
                 sys.exit(1)
 
+        if "lossless" in slide and not isinstance(slide["lossless"], bool):
+            print(
+                f"Error: Slide {i} lossless must be true or false, "
+                f"got: {slide['lossless']}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
         if "reference_image" in slide:
             ref = slide["reference_image"]
             if not isinstance(ref, str):
@@ -202,7 +337,15 @@ def write_progress(
     completed: List[str],
     failed: List[int],
     started_at: str,
+    force: bool = False,
 ) -> None:
+    global _last_progress_at
+
+    now = time.monotonic()
+    if not force and now - _last_progress_at < PROGRESS_MIN_INTERVAL:
+        return
+    _last_progress_at = now
+
     try:
         progress = {
             "current": current,
@@ -213,22 +356,24 @@ def write_progress(
             "started_at": started_at,
             "updated_at": datetime.now(UTC).isoformat() + "Z",
         }
+        # Serialize up front: json.dump() to a file issues one write per token
         temp_file = PROGRESS_FILE.with_suffix(".tmp")
-        with open(temp_file, "w") as f:
-            json.dump(progress, f, indent=2)
+        temp_file.write_text(json.dumps(progress, indent=2))
         temp_file.replace(PROGRESS_FILE)
     except Exception as e:
         print(f"Warning: Failed to write progress file: {e}", file=sys.stderr)
 
 
 def write_results(
-    completed: List[Dict], failed: List[int], errors: List[Dict], started_at: str
-) -> None:
+    completed: List[Dict],
+    failed: List[int],
+    errors: List[Dict],
+    started_at: str,
+    started_monotonic: float,
+) -> Dict:
     try:
         completed_at = datetime.now(UTC).isoformat() + "Z"
-        started_dt = datetime.fromisoformat(started_at.rstrip("Z"))
-        completed_dt = datetime.fromisoformat(completed_at.rstrip("Z"))
-        duration = (completed_dt - started_dt).total_seconds()
+        duration = time.monotonic() - started_monotonic
 
         results = {
             "completed": len(completed),
@@ -241,8 +386,8 @@ def write_results(
             "duration_seconds": int(duration),
         }
 
-        with open(RESULTS_FILE, "w") as f:
-            json.dump(results, f, indent=2)
+        RESULTS_FILE.write_text(json.dumps(results, indent=2))
+        return results
 
     except Exception as e:
         print(f"Error: Failed to write results file: {e}", file=sys.stderr)
@@ -250,9 +395,62 @@ def write_results(
 
 
 def generate_seed() -> int:
-    time.sleep(0.001)
-    timestamp_ns = time.time_ns()
-    return int(timestamp_ns % 2147483647)
+    """Random 31-bit seed; unlike a clock reading, safe across parallel workers."""
+    return secrets.randbits(31)
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing requests evenly at a requests-per-minute rate."""
+
+    def __init__(self, rpm: float):
+        self._interval = 60.0 / rpm
+        self._lock = threading.Lock()
+        self._next_at = time.monotonic()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Shared by every worker thread; configured in main() from rate_limit_rpm
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by the server's Retry-After header, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _call_with_retry(fn, *args, **kwargs):
+    """Call an API function, retrying transient errors with backoff and jitter."""
+    for attempt in range(MAX_RETRIES + 1):
+        if _rate_limiter is not None:
+            _rate_limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except TRANSIENT_ERRORS as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = RETRY_BASE_DELAY * 2**attempt + random.uniform(0, 1)
+            delay = min(delay, RETRY_MAX_DELAY)
+            print(
+                f"Transient API error ({type(e).__name__}), "
+                f"retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})",
+                file=sys.stderr,
+            )
+            time.sleep(delay)
 
 
 def _load_logo_base64(logo_path: Path) -> Optional[str]:
@@ -313,7 +511,8 @@ def _generate_gpt_image2(
     prompt: str,
 ) -> Tuple[bool, Optional[bytes], Optional[str]]:
     """Text-to-image via POST /images/generations for gpt-image-2."""
-    response = client.images.generate(
+    response = _call_with_retry(
+        client.images.generate,
         model=GPT_IMAGE_2,
         prompt=prompt,
         n=1,
@@ -347,7 +546,8 @@ def _edit_gpt_image2(
         else "image/png"
     )
 
-    response = client.images.edit(
+    response = _call_with_retry(
+        client.images.edit,
         model=GPT_IMAGE_2,
         image=(ref_path.name, img_bytes, mime),
         prompt=prompt,
@@ -361,6 +561,117 @@ def _edit_gpt_image2(
     return True, base64.b64decode(b64), None
 
 
+def _slide_output_path(output_dir: Path, slide_num: int, output_format: str) -> Path:
+    return output_dir / f"slide-{slide_num:02d}.{output_format}"
+
+
+def _fingerprint_path(output_path: Path) -> Path:
+    """Hidden sidecar recording which settings produced an output file."""
+    return output_path.with_name(f".{output_path.name}.hash")
+
+
+def _slide_fingerprint(slide: Dict, settings: Dict) -> str:
+    """Hash of everything that determines a slide's generated image."""
+    reference = slide.get("reference_image")
+    try:
+        reference_mtime = os.stat(reference).st_mtime_ns if reference else None
+    except OSError:
+        reference_mtime = None
+    payload = json.dumps(
+        {"slide": slide, "reference_mtime": reference_mtime, **settings},
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+def _is_up_to_date(output_path: Path, fingerprint: str) -> bool:
+    try:
+        return (
+            output_path.exists()
+            and _fingerprint_path(output_path).read_text() == fingerprint
+        )
+    except OSError:
+        return False
+
+
+def _cache_path(fingerprint: str, output_format: str) -> Path:
+    return CACHE_DIR / f"{fingerprint}.{output_format}"
+
+
+def _prune_cache(max_bytes: int = CACHE_MAX_BYTES) -> None:
+    """Delete the least recently used cache entries once the cache exceeds
+    ``max_bytes``; cache hits refresh an entry's mtime."""
+    try:
+        entries = []
+        for entry in os.scandir(CACHE_DIR):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    except OSError:
+        return  # no cache yet
+
+    total = 0
+    for _, size, path in sorted(entries, reverse=True):
+        total += size
+        if total > max_bytes:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def _is_cacheable(slide: Dict, model: str, global_seed: Optional[int]) -> bool:
+    """Only seeded generations are meant to be reproducible, so only they are
+    served from the cache; unseeded runs should yield a fresh image."""
+    if model == GPT_IMAGE_2:
+        return False
+    return slide.get("seed") is not None or global_seed is not None
+
+
+def _generate_chat_image(
+    client: OpenAI,
+    model: str,
+    prompt: str,
+    seed: int,
+    temperature: float,
+    logo_path: Optional[Path] = None,
+) -> Tuple[bool, Optional[bytes], Optional[str]]:
+    """Image generation via chat.completions, optionally with a logo reference."""
+    if logo_path is not None:
+        logo_b64 = _load_logo_base64(logo_path)
+        if logo_b64 is None:
+            return False, None, "Failed to load logo image"
+
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": f"data:image/png;base64,{logo_b64}"},
+                    },
+                    {"type": "text", "text": prompt},
+                ],
+            }
+        ]
+    else:
+        messages = [{"role": "user", "content": prompt}]
+
+    response = _call_with_retry(
+        client.chat.completions.create,
+        model=model,
+        messages=messages,
+        seed=seed,
+        temperature=temperature,
+        extra_body={"response_modalities": ["IMAGE"]},
+    )
+
+    image_bytes = _extract_image_bytes(response)
+    if image_bytes is None:
+        return False, None, "No image data in response"
+    return True, image_bytes, None
+
+
 def generate_slide(
     client: OpenAI,
     slide: Dict,
@@ -371,6 +682,7 @@ def generate_slide(
     global_temperature: Optional[float] = None,
     global_seed: Optional[int] = None,
     reference_image: Optional[str] = None,
+    webp_method: int = DEFAULT_WEBP_METHOD,
 ) -> Tuple[bool, Optional[str], Optional[str], Optional[int], Optional[float]]:
     """Generate a single slide.
 
@@ -382,7 +694,7 @@ def generate_slide(
     try:
         slide_num = slide["number"]
         prompt = slide["prompt"]
-        output_path = output_dir / f"slide-{slide_num:02d}.{output_format}"
+        output_path = _slide_output_path(output_dir, slide_num, output_format)
 
         # --- Shared: TrendLife layout detection ---
         layout_type = None
@@ -396,188 +708,156 @@ def generate_slide(
                 layout_type = "content"
                 is_trendlife_featured = False
             else:
-                from logo_overlay import detect_layout_type
-
                 layout_type = detect_layout_type(
                     slide["prompt"], slide_number=slide["number"]
                 )
                 is_trendlife_featured = layout_type == "title"
 
         # --- Shared: style prompt enhancement ---
-        if "style" in slide:
-            style = slide["style"]
-            if style == "professional":
-                prompt = f"Professional presentation slide: {prompt}. Clean, minimal design with clear typography."
-            elif style == "data-viz":
-                prompt = f"Data visualization slide: {prompt}. Clear charts and graphs, professional color scheme."
-            elif style == "infographic":
-                prompt = f"Infographic style: {prompt}. Visual storytelling with icons and illustrations."
-            elif style == "trendlife":
-                if is_trendlife_featured:
-                    prompt = f"{prompt}\n\nThis is a title/cover slide for TrendLife (Trend Micro presentations).\nCreate a professional cover design that incorporates the TrendLife logo provided as reference image.\nUse TrendLife brand colors:\n- Trend Red (#D71920) for title and accents\n- Supporting colors: Guardian Red (#6F0000), Dark gray (#57585B), Medium gray (#808285), Light gray (#E7E6E6)\n- Black (#000000) for text, white (#FFFFFF) for backgrounds\nIMPORTANT: Use the exact logo from the reference image - DO NOT modify, redraw, or stylize the logo.\nPosition it prominently (typically center or upper area).\nKeep the design clean and professional."
-                else:
-                    prompt = f"{prompt}\n\nUse TrendLife brand colors for Trend Micro presentations:\n- IMPORTANT: Title text and all headings MUST be in Trend Red (#D71920)\n- Primary accents and highlights: Trend Red (#D71920)\n- Guardian Red (#6F0000) for supporting elements and depth\n- Neutral palette: Dark gray (#57585B), medium gray (#808285), light gray (#E7E6E6)\n- Black (#000000) for body text, white (#FFFFFF) for backgrounds\nKeep the design clean, professional, and suitable for corporate presentations.\nDO NOT include any logos or brand text - these will be added separately."
-
-        use_lossless = output_format == "webp" and slide.get("style") in [
-            "professional",
-            "data-viz",
-            "infographic",
-            "trendlife",
-        ]
-
-        # --- gpt-image-2 routing ---
+        style = slide.get("style")
+        prompt = _apply_style(prompt, style, featured=is_trendlife_featured)
+        use_lossless = output_format == "webp" and slide.get("lossless", False)
+        if output_format == "webp" and style in _PRESENTATION_STYLES:
+            quality = max(quality, PRESENTATION_MIN_QUALITY)
+
+        # --- Backend: returns raw image bytes ---
+        seed = temperature = None
         if model == GPT_IMAGE_2:
-            logo_path = (
-                Path(__file__).parent.parent
-                / "assets/logos/trendlife-2026-logo-light.png"
-            )
-            if slide.get("style") == "trendlife" and is_trendlife_featured:
-                ok, image_bytes, err = _edit_gpt_image2(client, prompt, str(logo_path))
+            if is_trendlife_featured:
+                ok, image_bytes, err = _edit_gpt_image2(client, prompt, str(LOGO_PATH))
             elif reference_image:
                 ok, image_bytes, err = _edit_gpt_image2(client, prompt, reference_image)
             else:
                 ok, image_bytes, err = _generate_gpt_image2(client, prompt)
-
-            if not ok:
-                return False, None, err, None, None
-
-            image = PILImage.open(io.BytesIO(image_bytes))
-            _save_image(
-                image, output_path, output_format, quality, lossless=use_lossless
+        else:
+            temperature = slide.get(
+                "temperature",
+                global_temperature if global_temperature is not None else 1.0,
+            )
+            seed = slide.get("seed")
+            if seed is None:
+                seed = global_seed
+            if seed is None:
+                seed = generate_seed()
+
+            ok, image_bytes, err = _generate_chat_image(
+                client,
+                model,
+                prompt,
+                seed,
+                temperature,
+                logo_path=LOGO_PATH if is_trendlife_featured else None,
             )
 
-            if slide.get("style") == "trendlife" and not is_trendlife_featured:
-                from logo_overlay import overlay_logo
+        if not ok:
+            return False, None, err, None, None
 
-                temp_output = output_path.with_stem(output_path.stem + "_with_logo")
-                try:
-                    overlay_logo(
-                        background_path=output_path,
-                        logo_path=logo_path,
-                        output_path=temp_output,
-                        layout_type=layout_type,
-                    )
-                    temp_output.replace(output_path)
-                except Exception as e:
-                    print(
-                        f"Warning: Logo overlay failed for slide {slide['number']}: {e}",
-                        file=sys.stderr,
-                    )
-
-            return True, str(output_path), None, None, None
-
-        # --- Gemini / chat.completions routing ---
-        temperature = slide.get(
-            "temperature", global_temperature if global_temperature is not None else 1.0
+        # --- Shared: save, with TrendLife content logo composited in memory ---
+        _save_image(
+            image_bytes,
+            output_path,
+            output_format,
+            quality,
+            lossless=use_lossless,
+            webp_method=webp_method,
+            logo_layout=(
+                layout_type
+                if style == "trendlife" and not is_trendlife_featured
+                else None
+            ),
         )
 
-        seed = slide.get("seed")
-        if seed is None:
-            seed = global_seed
-        if seed is None:
-            seed = generate_seed()
-
-        # Build messages
-        if is_trendlife_featured:
-            logo_path = (
-                Path(__file__).parent.parent
-                / "assets/logos/trendlife-2026-logo-light.png"
-            )
-            logo_b64 = _load_logo_base64(logo_path)
-            if logo_b64 is None:
-                return False, None, "Failed to load logo image", None, None
+        return True, str(output_path), None, seed, temperature
 
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{logo_b64}"},
-                        },
-                        {"type": "text", "text": prompt},
-                    ],
-                }
-            ]
-        else:
-            messages = [{"role": "user", "content": prompt}]
-
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            seed=seed,
-            temperature=temperature,
-            extra_body={"response_modalities": ["IMAGE"]},
-        )
+    except Exception as e:
+        return False, None, str(e), None, None
 
-        image_bytes = _extract_image_bytes(response)
-        if image_bytes is None:
-            return False, None, "No image data in response", None, None
 
-        image = PILImage.open(io.BytesIO(image_bytes))
-        _save_image(image, output_path, output_format, quality, lossless=use_lossless)
+def _sniff_format(image_bytes: bytes) -> Optional[str]:
+    """Identify PNG, JPEG or WebP data from its signature."""
+    if image_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if image_bytes.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "webp"
+    return None
 
-        # TrendLife Logo Overlay
-        if slide.get("style") == "trendlife":
-            from logo_overlay import overlay_logo, detect_layout_type
 
-            explicit_layout = slide.get("layout")
-            should_overlay = True
+def _save_webp(
+    image: PILImage.Image,
+    output_path: Path,
+    quality: int,
+    lossless: bool,
+    webp_method: int,
+) -> None:
+    if lossless:
+        # For lossless WebP, Pillow's quality is compression effort, not
+        # fidelity: 0 encodes ~5x faster than 90 for ~10% larger files.
+        image.save(output_path, "WEBP", lossless=True, quality=0, method=webp_method)
+    else:
+        image.save(output_path, "WEBP", quality=quality, method=webp_method)
 
-            if explicit_layout == "featured":
-                should_overlay = False
-            elif explicit_layout == "content":
-                should_overlay = True
-            else:
-                if layout_type is None:
-                    layout_type = detect_layout_type(
-                        slide["prompt"], slide_number=slide["number"]
-                    )
-                should_overlay = layout_type != "title"
-
-            if should_overlay:
-                logo_path = (
-                    Path(__file__).parent.parent
-                    / "assets/logos/trendlife-2026-logo-light.png"
-                )
-                temp_output = output_path.with_stem(output_path.stem + "_with_logo")
-                try:
-                    overlay_logo(
-                        background_path=output_path,
-                        logo_path=logo_path,
-                        output_path=temp_output,
-                        layout_type=layout_type,
-                    )
-                    temp_output.replace(output_path)
-                except Exception as e:
-                    print(
-                        f"Warning: Logo overlay failed for slide {slide['number']}: {e}",
-                        file=sys.stderr,
-                    )
 
-        return True, str(output_path), None, seed, temperature
+def _save_png(
+    image: PILImage.Image,
+    output_path: Path,
+    quality: int,
+    lossless: bool,
+    webp_method: int,
+) -> None:
+    image.save(output_path, "PNG", optimize=True)
 
-    except Exception as e:
-        return False, None, str(e), None, None
+
+def _save_jpeg(
+    image: PILImage.Image,
+    output_path: Path,
+    quality: int,
+    lossless: bool,
+    webp_method: int,
+) -> None:
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGB")
+    image.save(output_path, "JPEG", quality=quality, optimize=True)
+
+
+# Supported output formats; load_config() rejects anything else up front
+_SAVERS: Dict[str, Callable[[PILImage.Image, Path, int, bool, int], None]] = {
+    "webp": _save_webp,
+    "png": _save_png,
+    "jpeg": _save_jpeg,
+    "jpg": _save_jpeg,
+}
 
 
 def _save_image(
-    image: PILImage.Image,
+    image_bytes: bytes,
     output_path: Path,
     output_format: str,
     quality: int,
     lossless: bool,
+    webp_method: int = DEFAULT_WEBP_METHOD,
+    logo_layout: Optional[str] = None,
 ) -> None:
-    if output_format == "webp":
-        image.save(output_path, "WEBP", quality=quality, lossless=lossless)
-    elif output_format == "png":
-        image.save(output_path, "PNG", optimize=True)
-    elif output_format in ["jpeg", "jpg"]:
-        if image.mode in ("RGBA", "LA", "P"):
-            image = image.convert("RGB")
-        image.save(output_path, "JPEG", quality=quality, optimize=True)
-    else:
-        raise ValueError(f"Unsupported format: {output_format}")
+    # Data already in the target format is written as-is rather than
+    # decoded to a full raster and re-encoded
+    target = "jpeg" if output_format == "jpg" else output_format
+    if logo_layout is None and _sniff_format(image_bytes) == target:
+        output_path.write_bytes(image_bytes)
+        return
+
+    # Close the decoded raster as soon as it is encoded; with several workers
+    # in flight it would otherwise linger until garbage collection
+    with PILImage.open(io.BytesIO(image_bytes)) as image:
+        if logo_layout is not None:
+            try:
+                image = composite_logo(image, LOGO_PATH, logo_layout)
+            except Exception as e:
+                print(
+                    f"Warning: Logo overlay failed for {output_path.name}: {e}",
+                    file=sys.stderr,
+                )
+        _SAVERS[output_format](image, output_path, quality, lossless, webp_method)
 
 
 def check_environment():
@@ -595,6 +875,8 @@ def check_environment():
 
 
 def main():
+    global _rate_limiter
+
     check_environment()
 
     try:
@@ -604,13 +886,18 @@ def main():
     except ImportError:
         pass
 
-    if len(sys.argv) != 3 or sys.argv[1] != "--config":
+    args = sys.argv[1:]
+    force = "--force" in args
+    if force:
+        args.remove("--force")
+    if len(args) != 2 or args[0] != "--config":
         print(
-            "Usage: uv run generate_images.py --config <config_file>", file=sys.stderr
+            "Usage: uv run generate_images.py --config <config_file> [--force]",
+            file=sys.stderr,
         )
         sys.exit(1)
 
-    config_path = sys.argv[2]
+    config_path = args[1]
     config = load_config(config_path)
 
     slides = config["slides"]
@@ -621,6 +908,9 @@ def main():
     quality = config.get("quality", 90)
     global_temperature = config.get("temperature")
     global_seed = config.get("seed")
+    concurrency = config.get("concurrency", DEFAULT_CONCURRENCY)
+    webp_method = config.get("webp_method", DEFAULT_WEBP_METHOD)
+    _rate_limiter = RateLimiter(config.get("rate_limit_rpm", DEFAULT_RATE_LIMIT_RPM))
 
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -645,12 +935,14 @@ def main():
         sys.exit(1)
 
     try:
-        client = OpenAI(api_key=api_key, base_url=base_url)
+        # Retries are handled by _call_with_retry, not the SDK's built-in ones
+        client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
     except Exception as e:
         print(f"Error: Failed to initialize API client: {e}", file=sys.stderr)
         sys.exit(1)
 
     started_at = datetime.now(UTC).isoformat() + "Z"
+    started_monotonic = time.monotonic()
     completed = []
     failed = []
     errors = []
@@ -671,46 +963,152 @@ def main():
                 file=sys.stderr,
             )
 
-    for i, slide in enumerate(slides):
+    settings = {
+        "model": model,
+        "format": output_format,
+        "quality": quality,
+        "temperature": global_temperature,
+        "seed": global_seed,
+        "webp_method": webp_method,
+    }
+    fingerprints = {}
+    pending = []
+    for slide in slides:
         slide_num = slide["number"]
-        status = f"generating slide {slide_num}..."
+        output_path = _slide_output_path(output_dir, slide_num, output_format)
+        fingerprint = _slide_fingerprint(slide, settings)
+        if not force and _is_up_to_date(output_path, fingerprint):
+            completed.append(
+                {
+                    "slide": slide_num,
+                    "path": str(output_path),
+                    "size_kb": output_path.stat().st_size // 1024,
+                    "reused": True,
+                }
+            )
+            print(f"= Slide {slide_num} unchanged, reusing: {output_path}")
+            continue
+
+        # The image is about to be replaced and its sidecar written only after
+        # that; drop the old one now so a crash in between cannot pair the new
+        # image with the old fingerprint
+        _fingerprint_path(output_path).unlink(missing_ok=True)
+
+        if not force and _is_cacheable(slide, model, global_seed):
+            try:
+                cache_path = _cache_path(fingerprint, output_format)
+                shutil.copyfile(cache_path, output_path)
+                os.utime(cache_path)  # mark as recently used for pruning
+                _fingerprint_path(output_path).write_text(fingerprint)
+            except OSError:
+                pass  # cache miss
+            else:
+                completed.append(
+                    {
+                        "slide": slide_num,
+                        "path": str(output_path),
+                        "size_kb": output_path.stat().st_size // 1024,
+                        "cached": True,
+                    }
+                )
+                print(f"= Slide {slide_num} found in cache: {output_path}")
+                continue
 
-        write_progress(
-            i, len(slides), status, [c["path"] for c in completed], failed, started_at
-        )
+        fingerprints[id(slide)] = fingerprint
+        pending.append(slide)
 
-        reference_image = slide.get("reference_image")
-        success, output_path, error, actual_seed, actual_temp = generate_slide(
-            client,
-            slide,
-            output_dir,
-            model,
-            output_format,
-            quality,
-            global_temperature,
-            global_seed,
-            reference_image=reference_image,
-        )
+    write_progress(
+        len(completed),
+        len(slides),
+        "generating slides...",
+        [c["path"] for c in completed],
+        failed,
+        started_at,
+    )
 
-        if success:
-            size_kb = Path(output_path).stat().st_size // 1024
-            slide_result = {"slide": slide_num, "path": output_path, "size_kb": size_kb}
-            if actual_seed is not None:
-                slide_result["seed"] = actual_seed
-            if actual_temp is not None:
-                slide_result["temperature"] = actual_temp
-            completed.append(slide_result)
-            print(f"✓ Slide {slide_num} completed: {output_path}")
-        else:
-            failed.append(slide_num)
-            errors.append(
-                {
+    # Register every Pillow codec (WebP is not among the preloaded ones) up
+    # front instead of racing plugin imports from the first worker saves
+    PILImage.init()
+
+    # Slides are independent and each call is dominated by API latency, so
+    # run up to `concurrency` at once; results are handled as they finish.
+    # The client's pooled keep-alive connections are shared by all workers
+    # and closed once the batch is done.
+    with (
+        client,
+        ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pending)))) as pool,
+    ):
+        futures = {
+            pool.submit(
+                generate_slide,
+                client,
+                slide,
+                output_dir,
+                model,
+                output_format,
+                quality,
+                global_temperature,
+                global_seed,
+                reference_image=slide.get("reference_image"),
+                webp_method=webp_method,
+            ): slide
+            for slide in pending
+        }
+
+        for done, future in enumerate(as_completed(futures), len(completed) + 1):
+            slide = futures[future]
+            slide_num = slide["number"]
+            success, output_path, error, actual_seed, actual_temp = future.result()
+
+            if success:
+                fingerprint = fingerprints[id(slide)]
+                try:
+                    _fingerprint_path(Path(output_path)).write_text(fingerprint)
+                    if _is_cacheable(slide, model, global_seed):
+                        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                        shutil.copyfile(
+                            output_path, _cache_path(fingerprint, output_format)
+                        )
+                except OSError:
+                    pass  # only costs a regeneration on the next run
+                size_kb = Path(output_path).stat().st_size // 1024
+                slide_result = {
                     "slide": slide_num,
-                    "error": error or "Unknown error",
-                    "timestamp": datetime.now(UTC).isoformat() + "Z",
+                    "path": output_path,
+                    "size_kb": size_kb,
                 }
+                if actual_seed is not None:
+                    slide_result["seed"] = actual_seed
+                if actual_temp is not None:
+                    slide_result["temperature"] = actual_temp
+                completed.append(slide_result)
+                print(f"✓ Slide {slide_num} completed: {output_path}")
+            else:
+                failed.append(slide_num)
+                errors.append(
+                    {
+                        "slide": slide_num,
+                        "error": error or "Unknown error",
+                        "timestamp": datetime.now(UTC).isoformat() + "Z",
+                    }
+                )
+                print(f"✗ Slide {slide_num} failed: {error}", file=sys.stderr)
+
+            write_progress(
+                done,
+                len(slides),
+                f"generated slide {slide_num}",
+                [c["path"] for c in completed],
+                failed,
+                started_at,
             )
-            print(f"✗ Slide {slide_num} failed: {error}", file=sys.stderr)
+
+    _prune_cache()
+
+    # Report in slide order regardless of completion order
+    completed.sort(key=lambda c: c["slide"])
+    failed.sort()
+    errors.sort(key=lambda e: e["slide"])
 
     write_progress(
         len(slides),
@@ -719,30 +1117,14 @@ def main():
         [c["path"] for c in completed],
         failed,
         started_at,
+        force=True,
     )
 
-    write_results(completed, failed, errors, started_at)
+    results = write_results(completed, failed, errors, started_at, started_monotonic)
 
     try:
         results_in_output = output_dir / "generation-results.json"
-        started_dt = datetime.fromisoformat(started_at.rstrip("Z"))
-        completed_at = datetime.now(UTC).isoformat() + "Z"
-        completed_dt = datetime.fromisoformat(completed_at.rstrip("Z"))
-        duration = (completed_dt - started_dt).total_seconds()
-
-        results = {
-            "completed": len(completed),
-            "failed": len(failed),
-            "total": len(completed) + len(failed),
-            "outputs": completed,
-            "errors": errors,
-            "started_at": started_at,
-            "completed_at": completed_at,
-            "duration_seconds": int(duration),
-        }
-
-        with open(results_in_output, "w") as f:
-            json.dump(results, f, indent=2)
+        results_in_output.write_text(json.dumps(results, indent=2))
     except Exception as e:
         print(
             f"Warning: Failed to write results to output directory: {e}",
@@ -15,6 +15,7 @@ When imported by other scripts (e.g., generate_images.py), it uses
 the parent script's environment.
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Tuple, Optional
 from PIL import Image as PILImage
@@ -149,36 +150,41 @@ def resize_logo_proportional(logo: PILImage.Image, target_width: int) -> PILImag
     return logo.resize((target_width, target_height), PILImage.Resampling.LANCZOS)
 
 
-def overlay_logo(
-    background_path: Path,
+@lru_cache(maxsize=4)
+def load_logo(logo_path: Path) -> PILImage.Image:
+    """
+    Load a logo as RGBA once per process.
+
+    The returned image is shared between callers and must not be modified.
+    """
+    return PILImage.open(logo_path).convert("RGBA")
+
+
+@lru_cache(maxsize=8)
+def _resized_logo(logo_path: Path, target_width: int) -> PILImage.Image:
+    # Slides in a deck share one size, so the LANCZOS downscale of the
+    # full-resolution logo runs once rather than once per slide
+    return resize_logo_proportional(load_logo(logo_path), target_width)
+
+
+def composite_logo(
+    background: PILImage.Image,
     logo_path: Path,
-    output_path: Path,
     layout_type: str = "default",
     opacity: Optional[float] = None,
-) -> Path:
+) -> PILImage.Image:
     """
-    Overlay logo on generated slide image with precise positioning.
+    Composite logo onto an in-memory slide image.
 
     Args:
-        background_path: Path to generated slide image
+        background: Slide image (any mode)
         logo_path: Path to logo PNG with transparency
-        output_path: Path for output image
         layout_type: Layout type ('title', 'content', 'divider', 'end', 'default')
         opacity: Optional opacity override (0.0-1.0)
 
     Returns:
-        Path to output image
-
-    Raises:
-        FileNotFoundError: If background or logo file not found
-        ValueError: If layout_type is invalid
+        New RGBA image with the logo applied
     """
-    # Validate inputs
-    if not background_path.exists():
-        raise FileNotFoundError(f"Background image not found: {background_path}")
-    if not logo_path.exists():
-        raise FileNotFoundError(f"Logo not found: {logo_path}")
-
     # Get positioning configuration
     if layout_type not in LOGO_POSITIONS:
         layout_type = "default"
@@ -186,19 +192,18 @@ def overlay_logo(
     config = LOGO_POSITIONS[layout_type]
     final_opacity = opacity if opacity is not None else config["opacity"]
 
-    # Load images
-    background = PILImage.open(background_path).convert("RGBA")
-    logo = PILImage.open(logo_path).convert("RGBA")
+    background = background.convert("RGBA")
 
     # Calculate target logo size
     slide_width, slide_height = background.size
     target_logo_width = int(slide_width * config["size_ratio"])
 
     # Resize logo proportionally
-    logo_resized = resize_logo_proportional(logo, target_logo_width)
+    logo_resized = _resized_logo(logo_path, target_logo_width)
 
-    # Apply opacity if needed
+    # Apply opacity if needed (on a copy; the resized logo is cached)
     if final_opacity < 1.0:
+        logo_resized = logo_resized.copy()
         alpha = logo_resized.split()[3]  # Get alpha channel
         alpha = alpha.point(lambda p: int(p * final_opacity))
         logo_resized.putalpha(alpha)
@@ -217,6 +222,43 @@ def overlay_logo(
     # Composite logo onto background
     background.paste(logo_resized, position, logo_resized)
 
+    return background
+
+
+def overlay_logo(
+    background_path: Path,
+    logo_path: Path,
+    output_path: Path,
+    layout_type: str = "default",
+    opacity: Optional[float] = None,
+) -> Path:
+    """
+    Overlay logo on generated slide image with precise positioning.
+
+    Args:
+        background_path: Path to generated slide image
+        logo_path: Path to logo PNG with transparency
+        output_path: Path for output image
+        layout_type: Layout type ('title', 'content', 'divider', 'end', 'default')
+        opacity: Optional opacity override (0.0-1.0)
+
+    Returns:
+        Path to output image
+
+    Raises:
+        FileNotFoundError: If background or logo file not found
+        ValueError: If layout_type is invalid
+    """
+    # Validate inputs
+    if not background_path.exists():
+        raise FileNotFoundError(f"Background image not found: {background_path}")
+    if not logo_path.exists():
+        raise FileNotFoundError(f"Logo not found: {logo_path}")
+
+    background = composite_logo(
+        PILImage.open(background_path), logo_path, layout_type, opacity
+    )
+
     # Convert back to RGB if saving as JPEG, keep RGBA for PNG/WebP
     if output_path.suffix.lower() in [".jpg", ".jpeg"]:
         background = background.convert("RGB")